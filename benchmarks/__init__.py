@@ -0,0 +1,14 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Benchmarks de las Rutas Críticas del Motor
+# ============================================
+#
+# Uso: python -m benchmarks [--output resultados.json] [--baseline base.json]
+#
+# Todo corre sin ventana (driver de video "dummy") para que los números
+# sean comparables entre máquinas de CI y equipos de desarrollo.
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,59 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Ejecutar Benchmarks: python -m benchmarks
+# ============================================
+
+import argparse
+import json
+import sys
+from benchmarks import cases  # Registra los casos
+from benchmarks.runner import BENCHMARKS, measure, environment, compare
+
+
+def main():
+    """Mide los casos pedidos, guarda el JSON y compara con la base"""
+    parser = argparse.ArgumentParser(description="Benchmarks del motor (sin ventana)")
+    parser.add_argument("names", nargs="*", help=f"Casos a medir (por defecto todos: {', '.join(BENCHMARKS)})")
+    parser.add_argument("--output", metavar="ARCHIVO", help="Guardar los resultados en JSON")
+    parser.add_argument("--baseline", metavar="ARCHIVO", help="JSON de una ejecución anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Caída máxima tolerada respecto a la base (0.1 = 10%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="Muestras por caso")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Segundos mínimos de medición por caso")
+    args = parser.parse_args()
+    
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Casos desconocidos: {', '.join(unknown)}")
+    
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    
+    results = {}
+    for name in args.names or list(BENCHMARKS):
+        results[name] = measure(BENCHMARKS[name], repeat=args.repeat, min_time=args.min_time)
+        result = results[name]
+        print(f"{name:24} {result['median']:>14,.0f} {result['unit']}/s  (±{result['stdev']:,.0f})",
+              flush=True)
+    
+    report = {"environment": environment(), "results": results}
+    regressions = []
+    if baseline is not None:
+        ratios, regressions = compare(results, baseline, args.threshold)
+        report["baseline"] = {"file": args.baseline, "ratios": ratios, "regressions": regressions}
+        print("\nComparación con la base:")
+        for name, ratio in ratios.items():
+            mark = "  ✗ REGRESIÓN" if name in regressions else ""
+            print(f"{name:24} {ratio:6.2f}x{mark}")
+    
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
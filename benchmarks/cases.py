@@ -0,0 +1,272 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Casos de Benchmark
+# ============================================
+
+import random
+from benchmarks.runner import benchmark
+from game.config import *
+from game.ball import Ball
+from game.paddle import Paddle
+from game.ai import AI
+from game.physics import handle_ball_collision
+from game.simulation import Simulation, TickInput
+from game.protocol import (
+    FrameReader, InputMessage, encode_input, encode_snapshot, encode_snapshot_delta,
+    apply_snapshot_delta, decode_payload, quantize_snapshot, dequantize_snapshot, MSG_SNAPSHOT_DELTA, HEADER,
+)
+from game.session import MatchSession
+
+
+TICKS_PER_CALL = 1000
+MESSAGES_PER_CALL = 1000
+
+
+def _scripted_inputs(count, seed=0):
+    """Entradas de teclado reproducibles: rachas de una misma dirección"""
+    rng = random.Random(seed)
+    inputs = []
+    while len(inputs) < count:
+        inputs.extend([TickInput(p1=rng.choice((-1, 0, 1)), p2=rng.choice((-1, 0, 1)))] * rng.randint(5, 40))
+    return inputs[:count]
+
+
+def _simulation_runner(mode):
+    """Función que avanza TICKS_PER_CALL ticks (reinicia la partida si termina)"""
+    simulation = Simulation(mode=mode, max_score=MAX_SCORE, seed=1)
+    initial = simulation.save_state()
+    inputs = _scripted_inputs(TICKS_PER_CALL)
+    
+    def run():
+        for tick_input in inputs:
+            if simulation.is_game_over():
+                simulation.load_state(initial)
+            simulation.step(tick_input)
+    return run
+
+
+@benchmark("physics_step", "ticks", ops=TICKS_PER_CALL)
+def physics_step():
+    """Simulation.step con dos jugadores (pelota, paletas, colisiones, puntos)"""
+    return _simulation_runner(MODE_LOCAL_MULTIPLAYER)
+
+
+@benchmark("physics_step_ai", "ticks", ops=TICKS_PER_CALL)
+def physics_step_ai():
+    """Simulation.step contra la IA"""
+    return _simulation_runner(MODE_SINGLE_PLAYER)
+
+
+def _ball_states(count, seed=0):
+    """Pelotas acercándose a la paleta derecha desde posiciones variadas"""
+    rng = random.Random(seed)
+    return [
+        (rng.uniform(100, WINDOW_WIDTH - 200), rng.uniform(10, WINDOW_HEIGHT - 10),
+         rng.uniform(BALL_SPEED, MAX_BALL_SPEED), rng.uniform(-MAX_BALL_SPEED, MAX_BALL_SPEED) * 0.7)
+        for _ in range(count)
+    ]
+
+
+def _predict_runner(physical):
+    """Función que llama a AI.predict_ball_position_advanced con 1000 pelotas"""
+    ball = Ball(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+    ai = AI(Paddle(WINDOW_WIDTH - 20 - PADDLE_WIDTH, WINDOW_HEIGHT // 2), ball, rng=random.Random(0))
+    states = _ball_states(1000)
+    
+    def run():
+        for ball.x, ball.y, ball.speed_x, ball.speed_y in states:
+            ai.predict_ball_position_advanced(physical=physical)
+    return run
+
+
+@benchmark("ai_predict", "calls", ops=1000)
+def ai_predict():
+    """Predicción O(1) de la IA (trayectoria plegada sin fricción)"""
+    return _predict_runner(physical=False)
+
+
+@benchmark("ai_predict_physical", "calls", ops=1000)
+def ai_predict_physical():
+    """Predicción de la IA con fricción y amortiguación"""
+    return _predict_runner(physical=True)
+
+
+@benchmark("collision", "calls", ops=1000)
+def collision():
+    """handle_ball_collision: mitad golpes reales, mitad pelotas lejos de la paleta"""
+    paddle = Paddle(20, WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2)
+    ball = Ball(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+    rng = random.Random(0)
+    hit_x = paddle.x + paddle.width // 2
+    positions = [
+        (hit_x if i % 2 == 0 else rng.uniform(200, WINDOW_WIDTH - 200),
+         paddle.y + rng.uniform(0, paddle.height))
+        for i in range(1000)
+    ]
+    
+    def run():
+        tick = 0
+        for x, y in positions:
+            ball.x, ball.y = x, y
+            ball.speed_x, ball.speed_y = -BALL_SPEED, 1.0
+            tick += COLLISION_COOLDOWN_TICKS  # Sin antirrebote entre muestras
+            handle_ball_collision(ball, paddle, from_left=True, tick=tick)
+    return run
+
+
+def _particle_bursts(count, pool=None):
+    """Partículas de `count` golpes, como las que crea Game en cada golpe"""
+    from game.particles import ParticlePool
+    pool = pool or ParticlePool()
+    rng = random.Random(0)
+    for _ in range(count):
+        pool.burst(rng.uniform(0, WINDOW_WIDTH), rng.uniform(0, WINDOW_HEIGHT), GREEN, count=12)
+    return pool
+
+
+def _particles_update_runner(bursts):
+    """Función que crea `bursts` ráfagas y las actualiza hasta que se apagan"""
+    from game.particles import ParticlePool
+    pool = ParticlePool()
+    
+    def run():
+        _particle_bursts(bursts, pool)
+        while pool.count:
+            pool.update()
+    return run
+
+
+@benchmark("particles_update", "updates", ops=20 * 12 * PARTICLE_LIFETIME)
+def particles_update():
+    """Crear 20 ráfagas de partículas y actualizarlas hasta que se apagan (Game.update)"""
+    return _particles_update_runner(20)
+
+
+@benchmark("particles_update_many", "updates", ops=300 * 12 * PARTICLE_LIFETIME)
+def particles_update_many():
+    """Lo mismo con 300 ráfagas (3600 partículas vivas a la vez)"""
+    return _particles_update_runner(300)
+
+
+@benchmark("particles_draw", "particles", ops=20 * 12)
+def particles_draw():
+    """Dibujar 20 ráfagas de partículas en una superficie fuera de pantalla"""
+    import pygame
+    screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pool = _particle_bursts(20)
+    
+    def run():
+        pool.draw(screen)
+    return run
+
+
+@benchmark("background_draw", "frames")
+def background_draw():
+    """draw_game_background: fondo, línea central y bordes"""
+    import pygame
+    from game.utils import draw_game_background
+    screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    return lambda: draw_game_background(screen)
+
+
+@benchmark("ball_draw", "frames")
+def ball_draw():
+    """Ball.draw con el rastro completo (lo que cuesta la pelota en cada frame)"""
+    import pygame
+    screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    ball = Ball(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2, rng=random.Random(0))
+    for _ in range(30):
+        ball.update()
+    
+    def run():
+        ball.draw(screen)
+    return run
+
+
+@benchmark("menu_draw", "frames")
+def menu_draw():
+    """Menu.draw del menú principal (títulos, opciones e instrucciones)"""
+    import pygame
+    from game.menu import Menu
+    pygame.init()
+    return Menu(pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))).draw
+
+
+@benchmark("game_draw", "frames")
+def game_draw():
+    """Game.draw completo (fondo, pelota, paletas, marcador, partículas y flip)"""
+    import pygame
+    from game.game import Game
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    game = Game(mode=MODE_LOCAL_MULTIPLAYER, seed=1)
+    game.init_display(screen, pygame.time.Clock())
+    for tick_input in _scripted_inputs(120):
+        game.simulation.step(tick_input)
+    _particle_bursts(3, game.particles)
+    return game.draw
+
+
+def _snapshots(count):
+    """Estados consecutivos de una partida del servidor, sin cuantizar"""
+    session = MatchSession(max_score=MAX_SCORE)
+    snapshots = []
+    for tick_input in _scripted_inputs(count):
+        session.simulation.step(tick_input)
+        snapshots.append(session.snapshot(1))
+    return snapshots
+
+
+@benchmark("net_encode_snapshot", "messages", ops=MESSAGES_PER_CALL)
+def net_encode_snapshot():
+    """Codificar estados completos"""
+    snapshots = _snapshots(MESSAGES_PER_CALL)
+    
+    def run():
+        for snapshot in snapshots:
+            encode_snapshot(snapshot)
+    return run
+
+
+@benchmark("net_encode_delta", "messages", ops=MESSAGES_PER_CALL)
+def net_encode_delta():
+    """Cuantizar un estado y codificarlo como delta respecto al de 2 ticks antes"""
+    snapshots = _snapshots(MESSAGES_PER_CALL + 2)
+    pairs = [(snapshot, baseline.tick, quantize_snapshot(baseline))
+             for snapshot, baseline in zip(snapshots[2:], snapshots)]
+    
+    def run():
+        for snapshot, baseline_tick, baseline_values in pairs:
+            encode_snapshot_delta(snapshot.tick, snapshot.ack_seq, quantize_snapshot(snapshot),
+                                  baseline_tick, baseline_values)
+    return run
+
+
+@benchmark("net_decode_delta", "messages", ops=MESSAGES_PER_CALL)
+def net_decode_delta():
+    """Decodificar un delta y reconstruir el estado completo"""
+    snapshots = _snapshots(MESSAGES_PER_CALL + 2)
+    frames = []
+    for snapshot, baseline in zip(snapshots[2:], snapshots):
+        baseline_values = quantize_snapshot(baseline)
+        data = encode_snapshot_delta(snapshot.tick, snapshot.ack_seq, quantize_snapshot(snapshot),
+                                     baseline.tick, baseline_values)
+        frames.append((dequantize_snapshot(baseline.tick, baseline.ack_seq, baseline_values), data[HEADER.size:]))
+    
+    def run():
+        for baseline, payload in frames:
+            apply_snapshot_delta(baseline, decode_payload(MSG_SNAPSHOT_DELTA, payload))
+    return run
+
+
+@benchmark("net_frame_reader", "messages", ops=MESSAGES_PER_CALL)
+def net_frame_reader():
+    """Reensamblar entradas llegadas en un flujo TCP cortado en trozos de 100 bytes"""
+    stream = b"".join(encode_input(InputMessage(seq, seq, seq % 3 - 1, seq)) for seq in range(1, MESSAGES_PER_CALL + 1))
+    chunks = [stream[i:i + 100] for i in range(0, len(stream), 100)]
+    
+    def run():
+        reader = FrameReader()
+        for chunk in chunks:
+            reader.feed(chunk)
+    return run
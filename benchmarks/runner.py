@@ -0,0 +1,101 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Medición de Benchmarks y Comparación con una Base
+# ============================================
+
+import platform
+import statistics
+import sys
+import time
+
+
+BENCHMARKS = {}  # nombre -> Benchmark, en orden de registro
+
+
+class Benchmark:
+    """Caso de benchmark: `setup()` retorna una función que hace `ops` operaciones"""
+    
+    def __init__(self, name, unit, setup, ops):
+        self.name = name
+        self.unit = unit
+        self.setup = setup
+        self.ops = ops
+
+
+def benchmark(name, unit, ops=1):
+    """Decorador que registra un caso
+    
+    La función decorada prepara el estado (sin medirse) y retorna la función
+    a medir; cada llamada a esta cuenta como `ops` operaciones de `unit`.
+    """
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, unit, setup, ops)
+        return setup
+    return register
+
+
+def measure(case, repeat=5, min_time=0.2):
+    """Mide un caso: calibra las llamadas por muestra y toma `repeat` muestras
+    
+    Retorna ops/s mediana y mejor (la mediana es la que se compara: es más
+    estable que la mejor ante otros procesos de la máquina).
+    """
+    run = case.setup()
+    
+    # Calibrar como timeit.autorange: cada muestra debe durar al menos min_time / repeat
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat:
+            break
+        calls *= 2
+    
+    rates = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        elapsed = time.perf_counter() - start
+        rates.append(calls * case.ops / elapsed)
+    
+    return {
+        "unit": case.unit,
+        "median": statistics.median(rates),
+        "best": max(rates),
+        "stdev": statistics.stdev(rates) if len(rates) > 1 else 0.0,
+        "samples": len(rates),
+    }
+
+
+def environment():
+    """Datos de la máquina para interpretar los resultados"""
+    info = {"python": sys.version.split()[0], "platform": platform.platform(), "machine": platform.machine()}
+    for module in ("pygame", "numpy"):
+        try:
+            info[module] = __import__(module).__version__
+        except ImportError:
+            info[module] = None
+    return info
+
+
+def compare(results, baseline, threshold=0.1):
+    """Compara con una ejecución anterior
+    
+    Retorna {nombre: cociente} (ops/s actual / base) y la lista de casos cuya
+    mediana bajó más de `threshold` (0.1 = 10%).
+    """
+    ratios = {}
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, result in results.items():
+        base = base_results.get(name)
+        if not base or not base.get("median"):
+            continue
+        ratio = result["median"] / base["median"]
+        ratios[name] = ratio
+        if ratio < 1 - threshold:
+            regressions.append(name)
+    return ratios, regressions
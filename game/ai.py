@@ -6,15 +6,18 @@
 import random
 import math
 from game.config import *
+from game.physics import fold_into_range
 
 
 class AI:
     """IA con dificultades ajustables - Difícil 10%, Medio 30%, Fácil 40% de ganar"""
     
-    def __init__(self, paddle, ball, difficulty=DIFFICULTY_NORMAL):
+    def __init__(self, paddle, ball, difficulty=DIFFICULTY_NORMAL, physical_prediction=False, rng=None):
         self.paddle = paddle
         self.ball = ball
         self.difficulty = difficulty
+        self.physical_prediction = physical_prediction  # Predicción con fricción y amortiguación
+        self.rng = rng or random.Random()  # Errores de puntería (Simulation le da uno de la partida)
         self.target_y = paddle.y + paddle.height // 2
         
         # Configurar parámetros según dificultad
@@ -23,8 +26,20 @@ class AI:
         # Contador para el tiempo de reacción
         self.reaction_counter = 0
     
-    def predict_ball_position_advanced(self):
-        """Predicción avanzada de la posición de la pelota"""
+    def reset(self):
+        """Olvida la reacción en curso (como una IA recién creada)"""
+        self.target_y = self.paddle.y + self.paddle.height // 2
+        self.reaction_counter = 0
+    
+    def predict_ball_position_advanced(self, physical=None):
+        """Predicción avanzada de la posición de la pelota
+        
+        Calcula en O(1) la altura a la que llegará la pelota a la paleta
+        plegando la trayectoria entre los bordes en lugar de simularla frame a
+        frame. Con `physical=True` (o `self.physical_prediction`) tiene en
+        cuenta además la fricción y la amortiguación de los rebotes de
+        Ball.update.
+        """
         # La IA está en paddle2 (derecha), por lo que verifica si pelota se acerca (speed_x > 0)
         # Si la pelota se aleja (speed_x < 0), no hacer nada
         if self.ball.speed_x <= 0:
@@ -36,25 +51,102 @@ class AI:
         if distance_x <= 0 or abs(self.ball.speed_x) < 0.1:
             return None
         
-        # Calcular tiempo hasta colisión
-        time_to_collision = distance_x / abs(self.ball.speed_x)
+        if physical is None:
+            physical = self.physical_prediction
+        if physical:
+            return self._predict_with_physics(distance_x)
         
-        # Predecir posición Y simulando toda la trayectoria
-        predicted_y = self.ball.y
-        predicted_vy = self.ball.speed_y
+        # Tiempo hasta colisión (en frames) y posición desplegada sin rebotes
+        time_to_collision = distance_x / abs(self.ball.speed_x)
+        steps = int(time_to_collision) + 1
+        unfolded_y = self.ball.y + self.ball.speed_y * steps
         
-        for _ in range(int(time_to_collision) + 1):
-            predicted_y += predicted_vy
+        # Simular rebotes plegando la trayectoria en [0, WINDOW_HEIGHT]
+        return fold_into_range(unfolded_y, 0, WINDOW_HEIGHT)
+    
+    def _predict_with_physics(self, distance_x):
+        """Predicción con fricción (BALL_DRAG) y amortiguación de rebotes
+        
+        Con fricción f por tick, tras n ticks la pelota recorre
+        v * (1 - f^n) / (1 - f). En cada rebote la velocidad vertical se
+        multiplica por WALL_BOUNCE_DAMPING, así que cada tramo entre bordes
+        "cuesta" más recorrido sin amortiguar: la suma es geométrica y el número
+        de rebotes se obtiene con un logaritmo.
+        """
+        drag = BALL_DRAG
+        damping = WALL_BOUNCE_DAMPING
+        speed_x = abs(self.ball.speed_x)
+        speed_y = self.ball.speed_y
+        
+        # Ticks hasta llegar a la paleta: x + vx * (1 - f^n) / (1 - f) >= paddle.x
+        remaining = 1 - distance_x * (1 - drag) / speed_x
+        if remaining <= 0:
+            return None  # La fricción la detendría antes de llegar
+        steps = int(math.log(remaining) / math.log(drag)) + 1
+        
+        # Si la pelota bajaría del mínimo de velocidad, Ball.update la acelera:
+        # en ese caso (saques lentos) se simula la trayectoria.
+        if speed_x * drag ** steps < BALL_SPEED * 0.8:
+            return self._simulate_ball_path(distance_x)
+        
+        # Bordes efectivos: Ball.update rebota con el radio de la pelota
+        low = self.ball.size // 2
+        high = WINDOW_HEIGHT - self.ball.size // 2
+        span = high - low
+        y = min(max(self.ball.y, low), high)
+        
+        # Recorrido vertical total si no hubiera amortiguación
+        travel = abs(speed_y) * (1 - drag ** steps) / (1 - drag)
+        direction = 1 if speed_y > 0 else -1
+        to_wall = high - y if direction > 0 else y - low
+        if travel <= to_wall or span <= 0:
+            return y + direction * travel
+        
+        # Primer rebote
+        travel -= to_wall
+        wall = high if direction > 0 else low
+        direction = -direction
+        
+        # Tramos completos entre bordes: el tramo k cuesta span / damping^k
+        growth = 1 / damping
+        full_spans = int(math.log(1 + travel * (growth - 1) / (span * growth)) / math.log(growth))
+        travel -= span * growth * (growth ** full_spans - 1) / (growth - 1)
+        if full_spans % 2 == 1:
+            wall = low if wall == high else high
+            direction = -direction
+        
+        # Tramo final, ya amortiguado por todos los rebotes
+        offset = max(0.0, travel) * damping ** (full_spans + 1)
+        return wall + direction * min(offset, span)
+    
+    def _simulate_ball_path(self, distance_x):
+        """Simula Ball.update tick a tick hasta llegar a la paleta"""
+        x, y = self.ball.x, self.ball.y
+        speed_x, speed_y = self.ball.speed_x, self.ball.speed_y
+        half = self.ball.size // 2
+        min_speed = BALL_SPEED * 0.8
+        target_x = self.ball.x + distance_x
+        
+        while x < target_x:
+            x += speed_x
+            y += speed_y
+            speed_x *= BALL_DRAG
+            speed_y *= BALL_DRAG
             
-            # Simular rebotes
-            if predicted_y < 0:
-                predicted_y = -predicted_y
-                predicted_vy = -predicted_vy
-            elif predicted_y > WINDOW_HEIGHT:
-                predicted_y = 2 * WINDOW_HEIGHT - predicted_y
-                predicted_vy = -predicted_vy
-        
-        return predicted_y
+            speed = math.sqrt(speed_x ** 2 + speed_y ** 2)
+            if speed < min_speed:
+                ratio = min_speed / speed if speed > 0 else 1
+                speed_x *= ratio
+                speed_y *= ratio
+            
+            if y - half <= 0:
+                y = half
+                speed_y = abs(speed_y) * WALL_BOUNCE_DAMPING
+            elif y + half >= WINDOW_HEIGHT:
+                y = WINDOW_HEIGHT - half
+                speed_y = -abs(speed_y) * WALL_BOUNCE_DAMPING
+        
+        return y
     
     def update(self):
         """Actualiza posición de la IA con inteligencia y reacción según dificultad"""
@@ -83,8 +175,8 @@ class AI:
             target = predicted_y
             
             # Agregar error según probabilidad y dificultad
-            if random.random() < self.error_chance:
-                target += random.randint(-self.prediction_error, self.prediction_error)
+            if self.rng.random() < self.error_chance:
+                target += self.rng.randint(-self.prediction_error, self.prediction_error)
             
             # Calcular diferencia
             difference = target - current_center
@@ -111,8 +203,8 @@ class AI:
         # Aplicar movimiento
         self.paddle.y += self.paddle.velocity
         self.paddle.y = max(0, min(WINDOW_HEIGHT - self.paddle.height, self.paddle.y))
-    
-    
+
+
     def _setup_difficulty_params(self, difficulty):
         """Configura los parámetros de IA según la dificultad seleccionada"""
         if difficulty == DIFFICULTY_HARD:  # 10% de ganar (casi imposible)
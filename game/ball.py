@@ -3,41 +3,69 @@
 # Clase Pelota
 # ============================================
 
-import pygame
 import math
 import random
+from collections import deque
 from game.config import *
 
 
+BALL_TRAIL_LENGTH = 16  # Posiciones guardadas para el rastro
+
+# Inclinación vertical del saque (en múltiplos de BALL_SPEED)
+OPENING_SPEEDS_Y = [-0.5, 0, 0.5]     # Primer saque de la partida
+SERVE_SPEEDS_Y = [-1, 0.5, -0.5, 1]   # Saques tras un punto
+
+# Círculos del rastro ya dibujados: largo del rastro -> [(superficie, radio)] por posición
+_trail_sprites = {}
+
+
+def _get_trail_sprites(length, size):
+    """Círculos del rastro para un largo dado (se dibujan una sola vez)
+    
+    El punto `i` (el 0 es el más viejo) se va aclarando y creciendo hacia
+    la pelota, igual que antes al dibujar cada círculo en cada frame.
+    """
+    sprites = _trail_sprites.get(length)
+    if sprites is None:
+        import pygame
+        sprites = []
+        for i in range(length):
+            alpha = int(50 * (i / length))
+            radius = max(1, int(size // 2 * (i / length)))
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (255 - alpha, 255 - alpha, 200), (radius, radius), radius)
+            sprites.append((surface, radius))
+        _trail_sprites[length] = sprites
+    return sprites
+
+
 class Ball:
     """Clase que representa la pelota del juego"""
     
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=None):
         self.x = float(x)
         self.y = float(y)
         self.start_x = x
         self.start_y = y
         self.size = BALL_SIZE
-        self.speed_x = BALL_SPEED * random.choice([-1, 1])
-        self.speed_y = BALL_SPEED * random.choice([-0.5, 0, 0.5])
-        self.trail = []  # Para efecto de rastro
-        self.max_trail_length = 15
-        self.last_collision_time = 0
+        rng = rng or random.Random()
+        self.speed_x = BALL_SPEED * rng.choice([-1, 1])
+        self.speed_y = BALL_SPEED * rng.choice(OPENING_SPEEDS_Y)
+        self.trail = deque(maxlen=BALL_TRAIL_LENGTH)  # Para efecto de rastro (las viejas salen solas)
+        self.last_collision_tick = -COLLISION_COOLDOWN_TICKS
     
     def update(self):
         """Actualiza posición de la pelota"""
         # Guardar posición anterior para el rastro
-        if len(self.trail) > self.max_trail_length:
-            self.trail.pop(0)
-        self.trail.append((self.x, self.y))
+        self.record_trail()
         
         # Actualizar posición
         self.x += self.speed_x
         self.y += self.speed_y
         
         # Aplicar fricción mínima (mantener velocidad)
-        self.speed_x *= 0.999
-        self.speed_y *= 0.999
+        self.speed_x *= BALL_DRAG
+        self.speed_y *= BALL_DRAG
         
         # Asegurar que no sea demasiado lenta
         speed = math.sqrt(self.speed_x ** 2 + self.speed_y ** 2)
@@ -49,19 +77,26 @@ class Ball:
         # Rebote en bordes superior e inferior
         if self.y - self.size // 2 <= 0:
             self.y = self.size // 2
-            self.speed_y = abs(self.speed_y) * 0.95
+            self.speed_y = abs(self.speed_y) * WALL_BOUNCE_DAMPING
         elif self.y + self.size // 2 >= WINDOW_HEIGHT:
             self.y = WINDOW_HEIGHT - self.size // 2
-            self.speed_y = -abs(self.speed_y) * 0.95
+            self.speed_y = -abs(self.speed_y) * WALL_BOUNCE_DAMPING
+    
+    def record_trail(self):
+        """Agrega la posición actual al rastro"""
+        self.trail.append((self.x, self.y))
     
     def draw(self, screen):
         """Dibuja la pelota con efecto de rastro"""
+        import pygame
+        
         # Dibujar rastro
-        for i, (x, y) in enumerate(self.trail):
-            alpha = int(50 * (i / len(self.trail)))
-            color = (255 - alpha, 255 - alpha, 200)
-            size = max(1, int(self.size // 2 * (i / len(self.trail))))
-            pygame.draw.circle(screen, color, (int(x), int(y)), size)
+        if self.trail:
+            sprites = _get_trail_sprites(len(self.trail), self.size)
+            screen.blits([
+                (surface, (int(x) - radius, int(y) - radius))
+                for (surface, radius), (x, y) in zip(sprites, self.trail)
+            ], doreturn=False)
         
         # Dibujar pelota principal
         pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.size // 2)
@@ -69,8 +104,14 @@ class Ball:
         # Efecto de brillo
         pygame.draw.circle(screen, CYAN, (int(self.x) - 2, int(self.y) - 2), self.size // 3, 1)
     
-    def reset(self, x=None, y=None):
-        """Reinicia la pelota a posición central"""
+    def reset(self, x=None, y=None, rng=None, opening=False):
+        """Reinicia la pelota a posición central
+        
+        `rng` elige la dirección del saque (Simulation pasa el generador de
+        la partida; sin él se usa uno nuevo, nunca el `random` global). Con
+        `opening=True` saca como al crear la pelota, al empezar una partida.
+        """
+        rng = rng or random.Random()
         if x is None:
             x = self.start_x
         if y is None:
@@ -78,19 +119,25 @@ class Ball:
         
         self.x = float(x)
         self.y = float(y)
-        self.speed_x = BALL_SPEED * random.choice([-1, 1])
-        self.speed_y = BALL_SPEED * random.choice([-1, 0.5, -0.5, 1])
-        self.trail = []
+        self.speed_x = BALL_SPEED * rng.choice([-1, 1])
+        self.speed_y = BALL_SPEED * rng.choice(OPENING_SPEEDS_Y if opening else SERVE_SPEEDS_Y)
+        self.trail.clear()
+        self.last_collision_tick = -COLLISION_COOLDOWN_TICKS
     
-    def get_rect(self):
-        """Retorna rectángulo de colisión"""
-        return pygame.Rect(
-            self.x - self.size // 2,
-            self.y - self.size // 2,
+    def get_bounds(self):
+        """Retorna rectángulo de colisión (x, y, ancho, alto) sin pygame"""
+        return (
+            int(self.x - self.size // 2),
+            int(self.y - self.size // 2),
             self.size,
             self.size
         )
     
+    def get_rect(self):
+        """Retorna rectángulo de colisión"""
+        import pygame
+        return pygame.Rect(self.get_bounds())
+    
     def get_speed(self):
         """Retorna velocidad actual"""
         return math.sqrt(self.speed_x ** 2 + self.speed_y ** 2)
@@ -0,0 +1,192 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Simulación por lotes con NumPy (N partidas a la vez)
+# ============================================
+
+import numpy as np
+from game.config import *
+
+
+# Posiciones fijas de las paletas (igual que en Simulation)
+PADDLE1_X = 20
+PADDLE2_X = WINDOW_WIDTH - 20 - PADDLE_WIDTH
+PADDLE_ACCELERATION = 0.5
+
+# Velocidades iniciales de la pelota (Ball.__init__ y Ball.reset)
+_START_DIR_X = np.array([-1.0, 1.0])
+_START_DIR_Y = np.array([-0.5, 0.0, 0.5])
+_RESET_DIR_Y = np.array([-1.0, 0.5, -0.5, 1.0])
+
+
+class BatchSimulation:
+    """N partidas independientes avanzadas en paralelo con arrays de NumPy
+    
+    Replica la física de Ball.update, Paddle.update, handle_ball_collision y
+    el conteo de puntos de Simulation.step, pero vectorizada sobre todas las
+    partidas. Las partidas que alcanzan `max_score` se congelan.
+    
+    `seed` es un entero o un numpy.random.Generator; los saques salen solo de
+    ese generador, así que la misma semilla repite las mismas partidas.
+    """
+    
+    def __init__(self, count, max_score=MAX_SCORE, seed=None):
+        self.count = count
+        self.max_score = max_score
+        self.rng = np.random.default_rng(seed)
+        
+        # Pelotas
+        self.ball_x = np.full(count, float(WINDOW_WIDTH // 2))
+        self.ball_y = np.full(count, float(WINDOW_HEIGHT // 2))
+        self.ball_vx = BALL_SPEED * self.rng.choice(_START_DIR_X, count)
+        self.ball_vy = BALL_SPEED * self.rng.choice(_START_DIR_Y, count)
+        self.last_collision_tick = np.full(count, -COLLISION_COOLDOWN_TICKS, dtype=np.int64)
+        
+        # Paletas
+        start_y = float(WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2)
+        self.paddle1_y = np.full(count, start_y)
+        self.paddle2_y = np.full(count, start_y)
+        self.paddle1_velocity = np.zeros(count)
+        self.paddle2_velocity = np.zeros(count)
+        
+        # Puntuación
+        self.score1 = np.zeros(count, dtype=np.int32)
+        self.score2 = np.zeros(count, dtype=np.int32)
+        self.finished = np.zeros(count, dtype=bool)
+        
+        self.tick = 0
+    
+    def step(self, p1_input=0, p2_input=0):
+        """Avanza un tick todas las partidas activas
+        
+        `p1_input` y `p2_input` son escalares o arrays de tamaño N con la
+        dirección de cada paleta (-1 arriba, 0 quieto, 1 abajo).
+        Retorna un array booleano con las partidas en las que hubo punto.
+        """
+        self.tick += 1
+        live = ~self.finished
+        
+        self._update_paddles(live, p1_input, p2_input)
+        self._update_balls(live)
+        self._handle_collisions(live, self.paddle1_y, self.paddle1_velocity, PADDLE1_X, from_left=True)
+        self._handle_collisions(live, self.paddle2_y, self.paddle2_velocity, PADDLE2_X, from_left=False)
+        return self._handle_goals(live)
+    
+    def run(self, ticks, p1_input=0, p2_input=0):
+        """Avanza `ticks` ticks con entradas constantes"""
+        for _ in range(ticks):
+            self.step(p1_input, p2_input)
+    
+    def _update_paddles(self, live, p1_input, p2_input):
+        """Paddle.update con entrada analógica, para ambas paletas"""
+        max_y = WINDOW_HEIGHT - PADDLE_HEIGHT
+        for y, velocity, direction in ((self.paddle1_y, self.paddle1_velocity, p1_input),
+                                       (self.paddle2_y, self.paddle2_velocity, p2_input)):
+            target = np.asarray(direction, dtype=float) * PADDLE_SPEED
+            new_velocity = velocity + (target - velocity) * PADDLE_ACCELERATION
+            np.copyto(velocity, new_velocity, where=live)
+            np.copyto(y, np.clip(y + velocity, 0, max_y), where=live)
+    
+    def _update_balls(self, live):
+        """Ball.update: movimiento, fricción, velocidad mínima y rebotes"""
+        x = self.ball_x + self.ball_vx
+        y = self.ball_y + self.ball_vy
+        vx = self.ball_vx * BALL_DRAG
+        vy = self.ball_vy * BALL_DRAG
+        
+        # Asegurar que no sea demasiado lenta
+        min_speed = BALL_SPEED * 0.8
+        speed = np.hypot(vx, vy)
+        slow = speed < min_speed
+        if slow.any():
+            ratio = np.where(speed > 0, min_speed / np.where(speed > 0, speed, 1), 1.0)
+            vx = np.where(slow, vx * ratio, vx)
+            vy = np.where(slow, vy * ratio, vy)
+        
+        # Rebote en bordes superior e inferior
+        half = BALL_SIZE // 2
+        top = y - half <= 0
+        bottom = ~top & (y + half >= WINDOW_HEIGHT)
+        y = np.where(top, half, np.where(bottom, WINDOW_HEIGHT - half, y))
+        vy = np.where(top, np.abs(vy) * WALL_BOUNCE_DAMPING,
+                      np.where(bottom, -np.abs(vy) * WALL_BOUNCE_DAMPING, vy))
+        
+        np.copyto(self.ball_x, x, where=live)
+        np.copyto(self.ball_y, y, where=live)
+        np.copyto(self.ball_vx, vx, where=live)
+        np.copyto(self.ball_vy, vy, where=live)
+    
+    def _handle_collisions(self, live, paddle_y, paddle_velocity, paddle_x, from_left):
+        """handle_ball_collision vectorizado para una de las paletas"""
+        half = BALL_SIZE // 2
+        ball_left = np.trunc(self.ball_x - half)
+        ball_top = np.trunc(self.ball_y - half)
+        paddle_top = np.trunc(paddle_y)
+        
+        hit = (live
+               & (ball_left < paddle_x + PADDLE_WIDTH) & (paddle_x < ball_left + BALL_SIZE)
+               & (ball_top < paddle_top + PADDLE_HEIGHT) & (paddle_top < ball_top + BALL_SIZE)
+               & (self.tick - self.last_collision_tick >= COLLISION_COOLDOWN_TICKS))
+        if not hit.any():
+            return
+        
+        idx = np.nonzero(hit)[0]
+        self.last_collision_tick[idx] = self.tick
+        
+        # Posicionar la pelota fuera de la paleta
+        if from_left:
+            self.ball_x[idx] = paddle_x + PADDLE_WIDTH + BALL_SIZE + 2
+        else:
+            self.ball_x[idx] = paddle_x - BALL_SIZE - 2
+        
+        # Ángulo según el punto de impacto (-70 a 70 grados)
+        hit_pos = np.clip((self.ball_y[idx] - paddle_y[idx]) / PADDLE_HEIGHT, 0.0, 1.0)
+        angle_rad = np.radians((hit_pos - 0.5) * 140)
+        
+        # Velocidad base con bonus por la velocidad de la paleta
+        velocity_bonus = 1.0 + (np.abs(paddle_velocity[idx]) / PADDLE_SPEED) * 0.5
+        base_speed = MAX_BALL_SPEED * 0.9 * velocity_bonus
+        
+        vx = np.abs(np.cos(angle_rad) * base_speed)
+        vy = np.sin(angle_rad) * base_speed
+        
+        # Asegurar velocidad mínima horizontal
+        vx = np.maximum(vx, MAX_BALL_SPEED * 0.7)
+        if not from_left:
+            vx = -vx
+        
+        # Limitar velocidad máxima
+        speed = np.hypot(vx, vy)
+        ratio = np.where(speed > MAX_BALL_SPEED, MAX_BALL_SPEED / speed, 1.0)
+        self.ball_vx[idx] = vx * ratio
+        self.ball_vy[idx] = vy * ratio
+    
+    def _handle_goals(self, live):
+        """Cuenta puntos, reinicia pelotas y marca partidas terminadas"""
+        left_goal = live & (self.ball_x < 0)
+        right_goal = live & ~left_goal & (self.ball_x > WINDOW_WIDTH)
+        scored = left_goal | right_goal
+        if not scored.any():
+            return scored
+        
+        self.score2 += left_goal
+        self.score1 += right_goal
+        
+        # Ball.reset en las partidas con punto
+        idx = np.nonzero(scored)[0]
+        self.ball_x[idx] = WINDOW_WIDTH // 2
+        self.ball_y[idx] = WINDOW_HEIGHT // 2
+        self.ball_vx[idx] = BALL_SPEED * self.rng.choice(_START_DIR_X, idx.size)
+        self.ball_vy[idx] = BALL_SPEED * self.rng.choice(_RESET_DIR_Y, idx.size)
+        self.last_collision_tick[idx] = -COLLISION_COOLDOWN_TICKS
+        
+        self.finished |= (self.score1 >= self.max_score) | (self.score2 >= self.max_score)
+        return scored
+    
+    def is_finished(self):
+        """Verifica si todas las partidas han terminado"""
+        return bool(self.finished.all())
+    
+    def get_winners(self):
+        """Retorna el ganador de cada partida (1, 2 o 0 si sigue en juego)"""
+        return np.where(self.score1 >= self.max_score, 1,
+                        np.where(self.score2 >= self.max_score, 2, 0))
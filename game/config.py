@@ -3,7 +3,6 @@
 # Configuraciones y Constantes Globales
 # ============================================
 
-import pygame
 import os
 
 # ============ RESOLUCIÓN ============
@@ -40,7 +39,10 @@ CENTER_LINE_GAP = 10
 
 # ============ PHYSICS ============
 BALL_FRICTION = 0.99
+BALL_DRAG = 0.999  # Fricción por tick aplicada en Ball.update
+WALL_BOUNCE_DAMPING = 0.95  # Pérdida de velocidad vertical al rebotar en bordes
 PADDLE_HITBOX_EXTRA = 5
+COLLISION_COOLDOWN_TICKS = 3  # ~50 ms a 60 FPS entre golpes de la misma pelota
 
 # ============ PUNTUACIÓN ============
 MAX_SCORE = 21
@@ -50,6 +52,7 @@ POINTS_PER_GOAL = 1
 MODE_SINGLE_PLAYER = "single"
 MODE_LOCAL_MULTIPLAYER = "local"
 MODE_ONLINE = "online"
+MODE_P2P = "p2p"
 
 # ============ DIFICULTADES IA ============
 DIFFICULTY_EASY = "easy"
@@ -68,10 +71,50 @@ DEFAULT_HOST = "localhost"
 DEFAULT_PORT = 5555
 NETWORK_TIMEOUT = 5
 BUFFER_SIZE = 4096
+SERVER_TICK_RATE = FPS      # Ticks de simulación por segundo en el servidor
+SNAPSHOT_RATE = 30          # Estados enviados por segundo a cada cliente
+MAX_QUEUED_INPUTS = 8       # Entradas pendientes por jugador antes de descartar las viejas
+MAX_PENDING_BYTES = 64 * 1024  # Si un cliente no lee, se le saltan estados (los viejos no sirven)
+MAX_CATCHUP_TICKS = 5       # Ticks que el servidor recupera de golpe si se atrasa
+INPUT_HISTORY_SIZE = 120    # Entradas sin confirmar que guarda el cliente para re-simular
+SNAPSHOT_BUFFER_SIZE = 32   # Estados recientes guardados para interpolar
+INTERPOLATION_DELAY = 0.1   # Segundos de retraso al dibujar entidades remotas
+MAX_EXTRAPOLATION = 0.25    # Segundos máximos de extrapolación si faltan estados
+
+# Transporte
+TRANSPORT_UDP = "udp"
+TRANSPORT_TCP = "tcp"
+NETWORK_TRANSPORT = TRANSPORT_UDP  # El cliente prueba UDP y si no responde usa TCP (ambos servidores escuchan UDP)
+UDP_CONNECT_TIMEOUT = 1.0   # Segundos esperando respuesta UDP antes de pasar a TCP
+RELIABLE_RESEND_INTERVAL = 0.1  # Reenvío de mensajes fiables sin confirmar
+UDP_KEEPALIVE_INTERVAL = 1.0    # Paquete vacío si no se envió nada en este tiempo
+MAX_DATAGRAM_SIZE = 1200    # Bytes por datagrama (menor que el MTU habitual)
+
+# Rollback P2P
+MAX_ROLLBACK_TICKS = 12     # Ticks que se puede adelantar a las entradas confirmadas del rival
+ROLLBACK_INPUT_DELAY = 0    # Ticks de retraso de la entrada local (0 = respuesta inmediata)
+
+# ============ REPETICIONES ============
+RECORD_REPLAYS = True       # Grabar las partidas (cliente local y servidor) en REPLAY_DIR
+REPLAY_DIR = os.path.join(BASE_DIR, "replays")
+REPLAY_KEYFRAME_INTERVAL = 5 * FPS  # Ticks entre estados completos (saltos rápidos al buscar)
+
+# ============ PERFILADO ============
+PROFILE_FRAMES = False      # Medir cada fase del frame desde el inicio (F3 lo activa en cualquier momento)
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")  # Trazas volcadas con F4
+PROFILE_WINDOW = 10 * FPS   # Frames usados para los percentiles del overlay
+PROFILE_TRACE_FRAMES = 5 * 60 * FPS  # Frames guardados para volcar (los últimos 5 minutos)
+PROFILE_SUMMARY_INTERVAL = FPS // 4  # Frames entre recálculos de los percentiles
+
+# ============ CACHÉ DE TEXTOS ============
+TEXT_CACHE_SIZE = 256                    # Textos renderizados guardados como máximo
+TEXT_CACHE_MAX_BYTES = 8 * 1024 * 1024   # Y como mucho estos bytes de píxeles
 
 # ============ ANIMACIÓN ============
 MENU_TRANSITION_SPEED = 300
 PARTICLE_LIFETIME = 30
+PARTICLE_CAPACITY = 4096  # Partículas vivas como máximo (las que no caben se descartan)
+SCORE_FLASH_TICKS = FPS  # Duración del destello tras un punto (1 s)
 
 # ============ ESTADOS ============
 STATE_MENU = "menu"
@@ -0,0 +1,28 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Registro de Fuentes Compartidas
+# ============================================
+
+import pygame
+
+
+_fonts = {}  # (archivo, tamaño) -> pygame.font.Font
+
+
+def get_font(size, face=None):
+    """Fuente de `size` puntos (`face` = archivo, None = la de pygame)
+    
+    Cada (archivo, tamaño) se carga una sola vez, la primera vez que se
+    pide, y se comparte en todo el proceso. Como son siempre los mismos
+    objetos, la caché de textos acierta también entre pantallas.
+    """
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(face, size)
+    return font
+
+
+def clear_fonts():
+    """Olvida las fuentes cargadas (necesario tras pygame.font.quit())"""
+    _fonts.clear()
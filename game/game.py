@@ -5,18 +5,25 @@
 
 import pygame
 import math
+import os
+import time
 from game.config import *
+from game.simulation import Simulation, TickInput, EVENT_PADDLE_HIT
 from game.ball import Ball
 from game.paddle import Paddle
-from game.scoreboard import Scoreboard
-from game.ai import AI
+from game.replay import ReplayRecorder, new_replay_path
+from game.profiler import FrameProfiler
+from game.particles import ParticlePool
+from game.fonts import get_font
+from game.text_cache import render_text
 from game.utils import *
 
 
 class Game:
     """Clase principal del juego"""
     
-    def __init__(self, mode=MODE_SINGLE_PLAYER, difficulty=DIFFICULTY_NORMAL, max_score=MAX_SCORE):
+    def __init__(self, mode=MODE_SINGLE_PLAYER, difficulty=DIFFICULTY_NORMAL, max_score=MAX_SCORE, network=None,
+                 seed=None, replay_label=None, replay_dir=REPLAY_DIR, profile=PROFILE_FRAMES):
         self.mode = mode
         self.difficulty = difficulty
         self.max_score = max_score
@@ -26,22 +33,64 @@ class Game:
         self.game_active = True
         self.paused = False
         
-        # Componentes del juego
-        self.ball = Ball(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
-        self.paddle1 = Paddle(20, WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2)
-        self.paddle2 = Paddle(WINDOW_WIDTH - 20 - PADDLE_WIDTH, WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2)
-        self.scoreboard = Scoreboard(max_score=max_score)
+        # Simulación (física, colisiones y puntuación)
+        self.simulation = Simulation(mode=mode, difficulty=difficulty, max_score=max_score, seed=seed)
+        self.ball = self.simulation.ball
+        self.paddle1 = self.simulation.paddle1
+        self.paddle2 = self.simulation.paddle2
+        self.scoreboard = self.simulation.scoreboard
+        self.ai = self.simulation.ai
         
-        # IA y efectos
-        self.ai = None
-        self.particles = []
-        self.countdown = 0
-        self.font_large = pygame.font.Font(None, 120)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
+        # Red: en modo online el servidor es dueño de la simulación; en P2P
+        # `network` es un RollbackPeer y ambos pares simulan con la misma semilla
+        self.network = network
+        self.last_snapshot = None
         
-        if mode == MODE_SINGLE_PLAYER:
-            self.ai = AI(self.paddle2, self.ball, difficulty=difficulty)
+        # Copias para dibujar la pelota y la paleta rival interpoladas
+        self.view_ball = Ball(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+        self.view_paddle = Paddle(0, WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2)
+        
+        # Repetición: solo en modos locales (las partidas en línea las graba el
+        # servidor). Cada partida va a un archivo nuevo <replay_dir>/<replay_label>-<fecha>.ppr
+        self.replay_label = replay_label
+        self.replay_dir = replay_dir
+        self.recorder = None
+        if replay_label and mode in (MODE_SINGLE_PLAYER, MODE_LOCAL_MULTIPLAYER):
+            self.start_replay()
+        
+        # Efectos
+        self.particles = ParticlePool()
+        self.font_large = get_font(120)
+        self.font_medium = get_font(48)
+        self.font_small = get_font(32)
+        
+        # Perfilado por fases: F3 muestra el overlay, F4 vuelca la traza
+        self.profiler = None
+        self.show_profiler = False
+        if profile:
+            self.enable_profiler()
+    
+    def enable_profiler(self):
+        """Empieza a medir el tiempo de cada fase del frame"""
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+            self.simulation.profiler = self.profiler
+        return self.profiler
+    
+    def dump_profile(self):
+        """Guarda la traza del perfilador en PROFILE_DIR (CSV y JSON)"""
+        if self.profiler is None:
+            return None
+        base = os.path.join(PROFILE_DIR, time.strftime("frames-%Y%m%d-%H%M%S"))
+        for extension in (".csv", ".json"):
+            self.profiler.dump(base + extension)
+        print(f"[PERFIL] Traza de {len(self.profiler.trace)} frames guardada en {base}.csv/.json")
+        return base
+    
+    @property
+    def countdown(self):
+        """Ticks restantes de la pausa tras un punto"""
+        return self.simulation.countdown
     
     def init_display(self, screen, clock):
         """Inicializa la pantalla"""
@@ -59,102 +108,169 @@ class Game:
                 if event.key == pygame.K_ESCAPE:
                     self.game_active = False
                 
-                elif event.key == pygame.K_SPACE:
+                elif event.key == pygame.K_SPACE and self.mode not in (MODE_ONLINE, MODE_P2P):
+                    # En línea la partida no se detiene para un solo jugador: no hay pausa
                     self.paused = not self.paused
+                
+                elif event.key == pygame.K_F3:
+                    self.enable_profiler()
+                    self.show_profiler = not self.show_profiler
+                
+                elif event.key == pygame.K_F4:
+                    self.dump_profile()
     
     def update(self):
         """Actualiza lógica del juego"""
         if self.paused:
             return
         
-        # Input del jugador 1
-        keys = pygame.key.get_pressed()
-        self.paddle1.update(keys=keys)
-        
-        # Input del jugador 2 o IA
-        if self.mode == MODE_SINGLE_PLAYER:
-            self.ai.update()
-        elif self.mode == MODE_LOCAL_MULTIPLAYER:
-            # W/S para jugador 2
-            local_keys = {
-                pygame.K_w: keys[pygame.K_w],
-                pygame.K_s: keys[pygame.K_s],
-                pygame.K_UP: keys[pygame.K_UP],
-                pygame.K_DOWN: keys[pygame.K_DOWN]
-            }
-            if local_keys[pygame.K_w]:
-                self.paddle2.y = max(0, self.paddle2.y - PADDLE_SPEED)
-            if local_keys[pygame.K_s]:
-                self.paddle2.y = min(WINDOW_HEIGHT - PADDLE_HEIGHT, self.paddle2.y + PADDLE_SPEED)
-        
-        # Actualizar pelota
-        self.ball.update()
-        
-        # Colisiones con paletas
-        if handle_ball_collision(self.ball, self.paddle1, from_left=True):
-            # Crear partículas
-            self.particles.extend(create_collision_particles(
-                self.ball.x, self.ball.y, GREEN, count=12
-            ))
-        
-        if handle_ball_collision(self.ball, self.paddle2, from_left=False):
-            # Crear partículas
-            self.particles.extend(create_collision_particles(
-                self.ball.x, self.ball.y, BLUE, count=12
-            ))
-        
-        # Verificar puntos
-        if self.ball.x < 0:
-            self.scoreboard.update_score(2)
-            self.ball.reset()
-            self.countdown = FPS  # Pequeña pausa antes de continuar
-        
-        elif self.ball.x > WINDOW_WIDTH:
-            self.scoreboard.update_score(1)
-            self.ball.reset()
-            self.countdown = FPS
+        # Input y simulación
+        if self.mode == MODE_ONLINE:
+            events = self._update_online()
+        elif self.mode == MODE_P2P:
+            events = self._update_p2p()
+        else:
+            inputs = self._read_input()
+            events = self.simulation.step(inputs)
+            if self.recorder is not None:
+                self.recorder.record(inputs)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.mark("update")  # Red y grabación tras el último tick simulado
+        
+        # Crear partículas en cada golpe
+        for event in events:
+            if event[0] == EVENT_PADDLE_HIT:
+                _, player, x, y = event
+                self.particles.burst(x, y, GREEN if player == 1 else BLUE, count=12)
         
         # Actualizar partículas
-        for particle in self.particles[:]:
-            particle.update()
-            if not particle.is_alive():
-                self.particles.remove(particle)
+        self.particles.update()
+        if profiler is not None:
+            profiler.mark("particles")
+    
+    def _update_online(self):
+        """Predice la entrada local y se corrige con los estados del servidor"""
+        if not self.network.is_connected():
+            self.game_active = False
+            return []
         
-        # Countdown
-        if self.countdown > 0:
-            self.countdown -= 1
+        events = self.network.predict(self._read_input().p1, self.simulation)
+        self.last_snapshot = self.network.get_snapshot()
+        
+        # El marcador llega también por el canal fiable, por si se pierden estados
+        score = self.network.get_score()
+        scoreboard = self.scoreboard
+        if score is not None and score.score1 + score.score2 > scoreboard.player1_score + scoreboard.player2_score:
+            self.simulation.apply_score(score.score1, score.score2, self.simulation.tick)
+        return events
+    
+    def _update_p2p(self):
+        """Rollback: la entrada local se aplica sin esperar al rival"""
+        if not self.network.is_connected():
+            self.game_active = False
+            return []
+        
+        return self.network.advance(self._read_input().p1, self.simulation)
+    
+    def _read_input(self):
+        """Convierte el teclado en la entrada de un tick de la simulación"""
+        keys = pygame.key.get_pressed()
+        
+        if self.mode == MODE_LOCAL_MULTIPLAYER:
+            # W/S para jugador 1, flechas para jugador 2
+            p1 = keys[pygame.K_s] - keys[pygame.K_w]
+            p2 = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+        else:
+            p1 = (keys[pygame.K_s] or keys[pygame.K_DOWN]) - (keys[pygame.K_w] or keys[pygame.K_UP])
+            p2 = 0
+        
+        return TickInput(p1=p1, p2=p2)
     
     def draw(self):
         """Dibuja todo en pantalla"""
+        profiler = self.profiler
         draw_game_background(self.screen)
+        if profiler is not None:
+            profiler.mark("background")
+        
+        ball, paddle1, paddle2 = self._get_view()
         
         # Dibujar pelota
-        self.ball.draw(self.screen)
+        ball.draw(self.screen)
         
         # Dibujar paletas
-        self.paddle1.draw(self.screen, color=GREEN if self.mode == MODE_SINGLE_PLAYER else NEON_GREEN)
-        self.paddle2.draw(self.screen, color=BLUE)
+        paddle1.draw(self.screen, color=GREEN if self.mode == MODE_SINGLE_PLAYER else NEON_GREEN)
+        paddle2.draw(self.screen, color=BLUE)
+        if profiler is not None:
+            profiler.mark("entities")
         
         # Dibujar puntuación
-        self.scoreboard.draw(self.screen)
+        self.scoreboard.draw(self.screen, tick=self.simulation.tick)
+        if profiler is not None:
+            profiler.mark("scoreboard")
         
         # Dibujar partículas
-        for particle in self.particles:
-            particle.draw(self.screen)
+        self.particles.draw(self.screen)
+        if profiler is not None:
+            profiler.mark("particles")
         
         # Dibujar pausa
         if self.paused:
             self._draw_pause_screen()
         
+        # En línea, hasta recibir el primer estado del servidor (o la primera entrada del rival)
+        waiting = (self.mode == MODE_ONLINE and self.last_snapshot is None
+                   or self.mode == MODE_P2P and not self.network.is_started())
+        if waiting:
+            draw_text(self.screen, "Esperando al otro jugador...", self.font_medium, CYAN,
+                      (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 80))
+        
         # Dibujar countdown
         if self.countdown > 0:
             alpha = int(255 * (self.countdown / FPS))
             size_multiplier = 1 + (1 - self.countdown / FPS) * 0.5
-            countdown_text = self.font_large.render("", True, WHITE)
+            countdown_text = render_text(self.font_large, "", True, WHITE)
             countdown_rect = countdown_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
             self.screen.blit(countdown_text, countdown_rect)
         
+        if self.show_profiler:
+            profiler.draw(self.screen)
+        if profiler is not None:
+            profiler.mark("hud")
+        
         pygame.display.flip()
+        if profiler is not None:
+            profiler.mark("flip")
+    
+    def _get_view(self):
+        """Pelota y paletas a dibujar
+        
+        En línea la paleta propia sale de la predicción local; la pelota y la
+        paleta rival se interpolan entre estados del servidor para que no den
+        saltos aunque lleguen menos estados por segundo que FPS.
+        """
+        if self.mode != MODE_ONLINE:
+            return self.ball, self.paddle1, self.paddle2
+        
+        view = self.network.get_interpolated_snapshot()
+        if view is None:
+            return self.ball, self.paddle1, self.paddle2
+        
+        self.view_ball.x = view.ball_x
+        self.view_ball.y = view.ball_y
+        self.view_ball.record_trail()
+        
+        if self.network.player_id == 1:
+            self.view_paddle.x = self.paddle2.x
+            self.view_paddle.y = view.paddle2_y
+            self.view_paddle.velocity = view.paddle2_velocity
+            return self.view_ball, self.paddle1, self.view_paddle
+        
+        self.view_paddle.x = self.paddle1.x
+        self.view_paddle.y = view.paddle1_y
+        self.view_paddle.velocity = view.paddle1_velocity
+        return self.view_ball, self.view_paddle, self.paddle2
     
     def _draw_pause_screen(self):
         """Dibuja pantalla de pausa"""
@@ -165,12 +281,12 @@ class Game:
         self.screen.blit(overlay, (0, 0))
         
         # Texto de pausa
-        pause_text = self.font_large.render("PAUSA", True, YELLOW)
+        pause_text = render_text(self.font_large, "PAUSA", True, YELLOW)
         pause_rect = pause_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 50))
         self.screen.blit(pause_text, pause_rect)
         
         # Instrucciones
-        resume_text = self.font_small.render("ESPACIO para continuar | ESC para salir", True, WHITE)
+        resume_text = render_text(self.font_small, "ESPACIO para continuar | ESC para salir", True, WHITE)
         resume_rect = resume_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
         self.screen.blit(resume_text, resume_rect)
     
@@ -179,20 +295,49 @@ class Game:
         self.game_active = True
         
         while self.running and self.game_active:
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
             self.handle_events()
+            if profiler is not None:
+                profiler.mark("events")
             self.update()
             self.draw()
+            if profiler is not None:
+                profiler.end_frame()
             self.clock.tick(FPS)
             
-            if self.scoreboard.is_game_over():
+            # En P2P el final debe estar confirmado: un rollback aún podría anularlo
+            if self.scoreboard.is_game_over() and (self.mode != MODE_P2P or self.network.is_confirmed()):
+                self.close_replay()
                 self.show_game_over()
                 self.game_active = False
+        
+        self.close_replay()
+    
+    def start_replay(self):
+        """Empieza a grabar la partida desde el estado actual de la simulación"""
+        path = new_replay_path(self.replay_label, self.replay_dir)
+        self.recorder = ReplayRecorder(self.simulation, path)
+        return path
+    
+    def close_replay(self):
+        """Termina de escribir la repetición, si se está grabando"""
+        if self.recorder is not None and not self.recorder.closed:
+            self.recorder.close()
+            print(f"[REPETICIÓN] {self.recorder.path}: {self.simulation.tick} ticks, "
+                  f"huella final {self.simulation.state_hash()}")
     
     def show_game_over(self):
         """Muestra pantalla de fin del juego"""
         waiting = True
-        font_title = pygame.font.Font(None, 96)
-        font_text = pygame.font.Font(None, 48)
+        font_title = get_font(96)
+        font_text = get_font(48)
+        
+        # Overlay (el mismo en todos los frames)
+        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        overlay.set_alpha(200)
+        overlay.fill(BLACK)
         
         while waiting and self.running:
             for event in pygame.event.get():
@@ -205,28 +350,24 @@ class Game:
             
             # Dibujar
             draw_game_background(self.screen)
-            
-            # Overlay
-            overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            overlay.set_alpha(200)
-            overlay.fill(BLACK)
             self.screen.blit(overlay, (0, 0))
             
             # Textos
-            title = font_title.render("¡GAME OVER!", True, YELLOW)
+            title = render_text(font_title, "¡GAME OVER!", True, YELLOW)
             title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 120))
             self.screen.blit(title, title_rect)
             
             winner = self.scoreboard.get_winner()
             if winner:
                 winner_color = GREEN if "1" in winner else BLUE
-                winner_text = font_title.render(f"{winner}", True, winner_color)
-                winner_text += font_text.render("¡GANA!", True, winner_color)
+                winner_text = render_text(font_title, f"{winner}", True, winner_color)
+                winner_text += render_text(font_text, "¡GANA!", True, winner_color)
                 winner_rect = winner_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 20))
                 self.screen.blit(winner_text, winner_rect)
                 
                 # Score final
-                score_text = font_text.render(
+                score_text = render_text(
+                    font_text,
                     f"{self.scoreboard.player1_score} - {self.scoreboard.player2_score}",
                     True, WHITE
                 )
@@ -234,7 +375,7 @@ class Game:
                 self.screen.blit(score_text, score_rect)
             
             # Instrucciones
-            instr_text = font_text.render("ENTER para volver al menú", True, GRAY)
+            instr_text = render_text(font_text, "ENTER para volver al menú", True, GRAY)
             instr_rect = instr_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
             self.screen.blit(instr_text, instr_rect)
             
@@ -242,11 +383,11 @@ class Game:
             self.clock.tick(FPS)
     
     def reset(self):
-        """Reinicia el juego"""
-        self.ball.reset()
-        self.paddle1.reset()
-        self.paddle2.reset()
-        self.scoreboard.reset()
-        self.particles = []
+        """Reinicia el juego (si se estaba grabando, la nueva partida va a otro archivo)"""
+        self.close_replay()
+        self.simulation.reset()
+        if self.recorder is not None:
+            self.start_replay()
+        self.particles.clear()
         self.paused = False
         self.game_active = False
@@ -0,0 +1,144 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Banco de Pruebas de Rollback en un Proceso (latencia y jitter simulados)
+# ============================================
+
+import argparse
+import heapq
+import random
+from game.config import *
+from game.protocol import FrameReader, encode_peer_inputs
+from game.rollback import RollbackSession
+from game.simulation import Simulation, TickInput
+
+
+class LoopbackLink:
+    """Enlace de red simulado en una dirección, con reloj virtual
+    
+    Cada envío llega tras `latency` ± `jitter` segundos (pueden adelantarse
+    unos a otros) o se pierde con probabilidad `loss`.
+    """
+    
+    def __init__(self, latency=0.05, jitter=0.0, loss=0.0, rng=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = rng or random.Random()
+        self.queue = []  # (hora de llegada, orden, datos)
+        self.sent = 0
+        self.dropped = 0
+    
+    def send(self, now, data):
+        """Envía bytes en el instante `now`"""
+        self.sent += 1
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        heapq.heappush(self.queue, (now + delay, self.sent, data))
+    
+    def receive(self, now):
+        """Retorna los envíos que ya llegaron en el instante `now`"""
+        arrived = []
+        while self.queue and self.queue[0][0] <= now:
+            arrived.append(heapq.heappop(self.queue)[2])
+        return arrived
+
+
+def _random_inputs(rng, ticks):
+    """Entradas de un jugador: rachas de una misma dirección, como con teclado"""
+    inputs = []
+    while len(inputs) < ticks:
+        inputs.extend([rng.choice((-1, 0, 1))] * rng.randint(5, 40))
+    return inputs[:ticks]
+
+
+def run_loopback_match(ticks=1800, latency=0.05, jitter=0.02, loss=0.0, seed=0,
+                       input_delay=ROLLBACK_INPUT_DELAY, max_rollback=MAX_ROLLBACK_TICKS):
+    """Juega una partida entre dos RollbackSession por enlaces simulados
+    
+    Ambos pares avanzan a FPS con entradas aleatorias y se comparan con una
+    simulación de referencia que recibe las entradas reales de los dos sin
+    retraso. Retorna un dict con el resultado y las estadísticas.
+    """
+    rng = random.Random(seed)
+    scripted = {1: _random_inputs(rng, ticks), 2: _random_inputs(rng, ticks)}
+    links = {1: LoopbackLink(latency, jitter, loss, rng), 2: LoopbackLink(latency, jitter, loss, rng)}
+    sessions = {
+        player_id: RollbackSession(Simulation(mode=MODE_P2P, seed=seed), player_id,
+                                   input_delay=input_delay, max_rollback=max_rollback)
+        for player_id in (1, 2)
+    }
+    readers = {1: FrameReader(), 2: FrameReader()}
+    
+    # Cada par intenta avanzar un frame por cada 1/FPS de reloj virtual; con
+    # mucha latencia esperan al rival, así que se deja margen de sobra
+    now = 0.0
+    frame = 1 / FPS
+    deadline = 3 * (ticks / FPS) * (1 + FPS * (latency + jitter) / max_rollback) + 5.0
+    while now < deadline:
+        now += frame
+        for player_id, session in sessions.items():
+            other = 2 if player_id == 1 else 1
+            
+            # Recibir lo que el rival envió (enlace rival -> este par)
+            for data in links[other].receive(now):
+                for _, message in readers[player_id].feed(data):
+                    session.receive(message)
+            
+            if session.simulation.tick + session.input_delay < ticks:
+                session.advance(scripted[player_id][session.simulation.tick])
+            else:
+                session.rollback()  # Sin más entradas: solo corregir los últimos ticks
+            links[player_id].send(now, encode_peer_inputs(session.outgoing()))
+        
+        if all(s.is_confirmed() and s.simulation.tick + s.input_delay >= ticks for s in sessions.values()):
+            break
+    
+    # Referencia: ambas entradas reales en cada tick (desplazadas por el retraso de entrada)
+    reference = Simulation(mode=MODE_P2P, seed=seed)
+    delayed = {player_id: [0] * input_delay + scripted[player_id] for player_id in (1, 2)}
+    final_tick = min(s.simulation.tick for s in sessions.values())
+    for tick in range(final_tick):
+        if reference.is_game_over():
+            break
+        reference.step(TickInput(p1=delayed[1][tick], p2=delayed[2][tick]))
+    
+    expected = reference.save_state()
+    states = {player_id: s.simulation.save_state() for player_id, s in sessions.items()}
+    return {
+        "ticks": final_tick,
+        "in_sync": states[1] == states[2] == expected,
+        "score": (reference.scoreboard.player1_score, reference.scoreboard.player2_score),
+        "rollbacks": {player_id: dict(s.stats) for player_id, s in sessions.items()},
+        "packets": {player_id: (link.sent, link.dropped) for player_id, link in links.items()},
+    }
+
+
+def main():
+    """Punto de entrada: python -m game.loopback --latency 80 --jitter 30"""
+    parser = argparse.ArgumentParser(description="Prueba el rollback P2P con latencia y jitter simulados")
+    parser.add_argument("--ticks", type=int, default=1800, help="Ticks de partida (por defecto 1800)")
+    parser.add_argument("--latency", type=float, default=50, help="Latencia en un sentido, en ms")
+    parser.add_argument("--jitter", type=float, default=20, help="Variación de la latencia, en ms")
+    parser.add_argument("--loss", type=float, default=0.0, help="Probabilidad de perder un paquete (0-1)")
+    parser.add_argument("--delay", type=int, default=ROLLBACK_INPUT_DELAY, help="Retraso de entrada en ticks")
+    parser.add_argument("--seeds", type=int, default=5, help="Número de partidas (semillas 0..N-1)")
+    args = parser.parse_args()
+    
+    failures = 0
+    for seed in range(args.seeds):
+        result = run_loopback_match(ticks=args.ticks, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                                    loss=args.loss, seed=seed, input_delay=args.delay)
+        status = "OK" if result["in_sync"] else "DESINCRONIZADO"
+        stats = result["rollbacks"][1]
+        print(f"Semilla {seed}: {status} | ticks {result['ticks']} | marcador {result['score']} | "
+              f"rollbacks {stats['rollbacks']} ({stats['resimulated_ticks']} ticks re-simulados), "
+              f"esperas {stats['stalls']}")
+        failures += not result["in_sync"]
+    
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Servidor de Partidas con asyncio (varias salas)
+# ============================================
+
+import asyncio
+import itertools
+import time
+from game.config import *
+from game.protocol import (
+    FrameReader, ProtocolError,
+    MSG_JOIN, MSG_INPUT, encode_welcome, encode_error, encode_score,
+)
+from game.replay import new_replay_path
+from game.session import MatchSession
+from game.simulation import EVENT_GOAL
+from game.udp import UdpChannel
+
+
+JOIN_TIMEOUT = NETWORK_TIMEOUT
+
+
+class Player:
+    """Conexión TCP de un jugador dentro de una sala (la sala le asigna el id)"""
+    
+    def __init__(self, reader, writer, frames=None):
+        self.player_id = None
+        self.reader = reader
+        self.writer = writer
+        self.frames = frames if frames is not None else FrameReader()
+    
+    def send(self, data):
+        """Envía bytes sin bloquear; descarta el envío si el cliente va atrasado"""
+        transport = self.writer.transport
+        if transport.is_closing() or transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+            return False
+        self.writer.write(data)
+        return True
+    
+    def send_reliable(self, data):
+        """Envía un mensaje que no puede perderse (TCP ya es fiable)"""
+        return self.send(data)
+    
+    def close(self):
+        """Cierra la conexión"""
+        if not self.writer.transport.is_closing():
+            self.writer.close()
+
+
+class UdpPlayer:
+    """Jugador conectado por UDP dentro de una sala
+    
+    Los estados viajan por el canal secuenciado (si se pierden, el siguiente
+    los reemplaza); la bienvenida y el marcador por el fiable. El servidor
+    llama a `poll()` periódicamente para reenviar fiables y mandar keepalives.
+    """
+    
+    def __init__(self, channel, transport):
+        self.player_id = None
+        self.channel = channel
+        self.transport = transport
+        self.closed = False
+    
+    def send(self, data):
+        """Envía un datagrama con `data` (no fiable) y los fiables pendientes"""
+        if self.closed or self.transport.is_closing():
+            return False
+        self.transport.sendto(self.channel.build_packet(data), self.channel.address)
+        return True
+    
+    def send_reliable(self, data):
+        """Encola un mensaje en el canal fiable y lo envía ya"""
+        self.channel.queue_reliable(data)
+        return self.send(b"")
+    
+    def poll(self, now):
+        """Reenvía fiables o manda keepalive; False si el cliente lleva NETWORK_TIMEOUT callado"""
+        if now - self.channel.last_receive_time > NETWORK_TIMEOUT:
+            return False
+        if self.channel.needs_send(now):
+            self.send(b"")
+        return True
+    
+    def close(self):
+        """Deja de enviar (el cliente lo detecta por silencio, como con NetworkServer)"""
+        self.closed = True
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    """Entrega los datagramas recibidos al MatchServer"""
+    
+    def __init__(self, server):
+        self.server = server
+    
+    def datagram_received(self, data, address):
+        self.server._receive_datagram(data, address)
+
+
+class Room:
+    """Sala de una partida: dos jugadores, su simulación y su tarea de ticks"""
+    
+    def __init__(self, name, max_score=MAX_SCORE, tick_rate=SERVER_TICK_RATE, snapshot_rate=SNAPSHOT_RATE,
+                 replay_dir=None):
+        self.name = name
+        self.tick_rate = tick_rate
+        self.players = {}
+        replay_path = None
+        if replay_dir is not None:
+            label = "room-" + "".join(c if c.isalnum() else "_" for c in name)
+            replay_path = new_replay_path(label, replay_dir)
+        self.session = MatchSession(max_score=max_score, tick_rate=tick_rate, snapshot_rate=snapshot_rate,
+                                    replay_path=replay_path)
+        self.tick_task = None
+        self.closed = False
+    
+    def is_full(self):
+        """Verifica si la sala ya tiene dos jugadores"""
+        return len(self.players) >= 2
+    
+    def add_player(self, player):
+        """Agrega un jugador (Player o UdpPlayer) a la sala, le asigna id y lo retorna"""
+        player_id = 1 if 1 not in self.players else 2
+        player.player_id = player_id
+        self.players[player_id] = player
+        player.send_reliable(encode_welcome(player_id, self.session.max_score, self.tick_rate))
+        
+        if self.is_full():
+            self.tick_task = asyncio.create_task(self._tick_loop())
+        return player
+    
+    def handle_messages(self, player, messages):
+        """Procesa los mensajes recibidos de un jugador"""
+        for msg_type, message in messages:
+            if msg_type == MSG_INPUT:
+                self.session.add_input(player.player_id, message)
+    
+    async def _tick_loop(self):
+        """Simula la partida y envía el estado a ambos jugadores a ritmo fijo"""
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        
+        while not self.closed and not self.session.is_game_over():
+            events, send = self.session.step()
+            if send:
+                self.broadcast()
+            if any(event[0] == EVENT_GOAL for event in events):
+                score = encode_score(self.session.score())
+                for player in self.players.values():
+                    player.send_reliable(score)
+            
+            # Programar el siguiente tick sin acumular deriva
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()  # Vamos tarde: no intentar recuperar ticks perdidos
+                delay = 0
+            await asyncio.sleep(delay)
+        
+        self.session.close()
+    
+    def broadcast(self):
+        """Envía a cada jugador el estado autoritativo de la partida"""
+        for player in self.players.values():
+            player.send(self.session.encode_snapshot(player.player_id))
+    
+    def close(self):
+        """Termina la partida y desconecta a los jugadores"""
+        self.closed = True
+        self.session.close()
+        if self.tick_task is not None and self.tick_task is not asyncio.current_task():
+            self.tick_task.cancel()
+        for player in self.players.values():
+            player.close()
+
+
+class MatchServer:
+    """Servidor asyncio que aloja muchas partidas simultáneas en un proceso
+    
+    Cada cliente se conecta y envía MSG_JOIN con el nombre de la sala (vacío
+    para entrar en la primera sala con un lugar libre). Cuando la sala tiene
+    dos jugadores empieza su tarea de ticks; si un jugador se va, la sala se
+    cierra y se desconecta al otro.
+    
+    Con `udp=True` escucha también en UDP en el mismo puerto (como
+    NetworkServer), así los clientes que prueban UDP primero no esperan a
+    UDP_CONNECT_TIMEOUT; en una sala pueden mezclarse jugadores TCP y UDP.
+    """
+    
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_score=MAX_SCORE,
+                 tick_rate=SERVER_TICK_RATE, snapshot_rate=SNAPSHOT_RATE, replay_dir=None, udp=True):
+        self.host = host
+        self.port = port
+        self.max_score = max_score
+        self.tick_rate = tick_rate
+        self.snapshot_rate = snapshot_rate
+        self.replay_dir = replay_dir  # Directorio donde grabar cada partida (None = no grabar)
+        self.rooms = {}
+        self.server = None
+        self._room_ids = itertools.count(1)
+        self.udp = udp
+        self.udp_transport = None
+        self.udp_players = {}  # dirección -> (sala, UdpPlayer)
+        self.udp_task = None
+    
+    async def start(self):
+        """Abre los sockets de escucha (TCP y, con `udp`, UDP)"""
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        if self.udp:
+            loop = asyncio.get_running_loop()
+            self.udp_transport, _ = await loop.create_datagram_endpoint(
+                lambda: _DatagramProtocol(self), local_addr=(self.host, self.port))
+            self.udp_task = asyncio.create_task(self._udp_maintenance())
+        print(f"[SERVIDOR] Iniciado en {self.host}:{self.port}" + (" (TCP y UDP)" if self.udp else ""))
+    
+    async def serve_forever(self):
+        """Inicia el servidor y atiende clientes hasta que se cancele"""
+        if self.server is None:
+            await self.start()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            self.stop()
+    
+    def stop(self):
+        """Cierra todas las salas y el socket de escucha"""
+        for room in list(self.rooms.values()):
+            room.close()
+        self.rooms.clear()
+        self.udp_players.clear()
+        if self.udp_task is not None:
+            self.udp_task.cancel()
+        if self.udp_transport is not None:
+            self.udp_transport.close()
+        if self.server is not None:
+            self.server.close()
+        print("[SERVIDOR] Detenido")
+    
+    def get_room_count(self):
+        """Retorna el número de salas abiertas"""
+        return len(self.rooms)
+    
+    def _find_room(self, name):
+        """Busca (o crea) la sala pedida; None si está llena"""
+        if not name:
+            # Emparejamiento rápido: primera sala automática con lugar libre
+            for room in self.rooms.values():
+                if room.name.startswith("#") and not room.is_full():
+                    return room
+            name = f"#{next(self._room_ids)}"
+        
+        room = self.rooms.get(name)
+        if room is None:
+            room = Room(name, max_score=self.max_score, tick_rate=self.tick_rate,
+                        snapshot_rate=self.snapshot_rate, replay_dir=self.replay_dir)
+            self.rooms[name] = room
+        elif room.is_full():
+            return None
+        return room
+    
+    def _close_room(self, room):
+        """Cierra una sala (desconecta a todos) y la quita de la lista"""
+        if not room.closed:
+            room.close()
+        if self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+    
+    def _receive_datagram(self, data, address):
+        """Procesa un datagrama: entradas de un jugador UDP o un MSG_JOIN nuevo"""
+        entry = self.udp_players.get(address)
+        if entry is not None and entry[1].closed:
+            del self.udp_players[address]
+            entry = None
+        
+        channel = entry[1].channel if entry is not None else UdpChannel(address)
+        try:
+            messages = channel.receive_packet(data)
+        except ProtocolError:
+            return  # Datagrama ajeno o corrupto
+        
+        if entry is not None:
+            entry[0].handle_messages(entry[1], messages)
+            return
+        
+        joins = [room_name for msg_type, room_name in messages if msg_type == MSG_JOIN]
+        if not joins:
+            return
+        room = self._find_room(joins[0])
+        if room is None:
+            channel.queue_reliable(encode_error(f"La sala {joins[0]} está llena"))
+            self.udp_transport.sendto(channel.build_packet(), address)
+            return
+        
+        player = room.add_player(UdpPlayer(channel, self.udp_transport))
+        self.udp_players[address] = (room, player)
+        room.handle_messages(player, messages)
+        print(f"[SERVIDOR] Jugador {player.player_id} conectado por UDP a la sala {room.name} desde {address}")
+    
+    async def _udp_maintenance(self):
+        """Reenvía fiables, manda keepalives y cierra las salas de jugadores UDP callados"""
+        while True:
+            await asyncio.sleep(RELIABLE_RESEND_INTERVAL)
+            now = time.perf_counter()
+            for address, (room, player) in list(self.udp_players.items()):
+                if player.closed:
+                    del self.udp_players[address]
+                elif not player.poll(now):
+                    print(f"[SERVIDOR] Jugador {player.player_id} de la sala {room.name} sin respuesta por UDP")
+                    del self.udp_players[address]
+                    self._close_room(room)
+    
+    async def _read_join(self, reader, frames):
+        """Espera el mensaje MSG_JOIN; retorna (sala pedida, mensajes sobrantes)"""
+        while True:
+            data = await reader.read(BUFFER_SIZE)
+            if not data:
+                raise ConnectionError("Conexión cerrada antes de unirse")
+            messages = frames.feed(data)
+            if messages:
+                msg_type, room_name = messages[0]
+                if msg_type != MSG_JOIN:
+                    raise ProtocolError("Se esperaba MSG_JOIN")
+                return room_name, messages[1:]
+    
+    async def _handle_client(self, reader, writer):
+        """Atiende a un cliente: lobby, juego y desconexión"""
+        address = writer.get_extra_info("peername")
+        frames = FrameReader()
+        
+        try:
+            room_name, pending = await asyncio.wait_for(self._read_join(reader, frames), JOIN_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError, ProtocolError) as e:
+            print(f"[SERVIDOR] Conexión rechazada de {address}: {e}")
+            writer.close()
+            return
+        
+        room = self._find_room(room_name)
+        if room is None:
+            writer.write(encode_error(f"La sala {room_name} está llena"))
+            writer.close()
+            return
+        
+        player = room.add_player(Player(reader, writer, frames))
+        room.handle_messages(player, pending)
+        print(f"[SERVIDOR] Jugador {player.player_id} conectado a la sala {room.name} desde {address}")
+        
+        try:
+            while not room.closed:
+                data = await reader.read(BUFFER_SIZE)
+                if not data:
+                    break
+                room.handle_messages(player, player.frames.feed(data))
+        except (ConnectionError, ProtocolError) as e:
+            print(f"[SERVIDOR] Error con jugador {player.player_id} en sala {room.name}: {e}")
+        finally:
+            print(f"[SERVIDOR] Jugador {player.player_id} desconectado de la sala {room.name}")
+            self._close_room(room)
@@ -6,6 +6,8 @@
 import pygame
 import socket
 from game.config import *
+from game.fonts import get_font
+from game.text_cache import render_text
 
 
 def get_local_ip():
@@ -25,9 +27,9 @@ class Menu:
     
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, 96)
-        self.font_option = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
+        self.font_title = get_font(96)
+        self.font_option = get_font(48)
+        self.font_small = get_font(32)
         
         self.selected_option = 0
         self.options = [
@@ -54,8 +56,8 @@ class Menu:
             pygame.draw.line(self.screen, GRAY, (50, y), (WINDOW_WIDTH - 50, y), 1)
         
         # Título
-        title = self.font_title.render("PING-PONG", True, NEON_GREEN)
-        subtitle = self.font_title.render("ULTIMATE", True, CYAN)
+        title = render_text(self.font_title, "PING-PONG", True, NEON_GREEN)
+        subtitle = render_text(self.font_title, "ULTIMATE", True, CYAN)
         
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 80))
         subtitle_rect = subtitle.get_rect(center=(WINDOW_WIDTH // 2, 180))
@@ -64,7 +66,7 @@ class Menu:
         self.screen.blit(subtitle, subtitle_rect)
         
         # Versión
-        version = self.font_small.render("v1.0 - EDITION", True, GRAY)
+        version = render_text(self.font_small, "v1.0 - EDITION", True, GRAY)
         version_rect = version.get_rect(center=(WINDOW_WIDTH // 2, 240))
         self.screen.blit(version, version_rect)
         
@@ -83,7 +85,7 @@ class Menu:
                 if (current_time // 200) % 2 == 0:
                     color = YELLOW
             
-            option_text = self.font_option.render(option["text"], True, color)
+            option_text = render_text(self.font_option, option["text"], True, color)
             option_rect = option_text.get_rect(center=(WINDOW_WIDTH // 2, option_start_y + i * 70))
             
             # Dibuja selector
@@ -95,7 +97,7 @@ class Menu:
             self.screen.blit(option_text, option_rect)
         
         # Instrucciones
-        instructions = self.font_small.render("↑/↓ Seleccionar | ENTER Confirmar", True, GRAY)
+        instructions = render_text(self.font_small, "↑/↓ Seleccionar | ENTER Confirmar", True, GRAY)
         instructions_rect = instructions.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 40))
         self.screen.blit(instructions, instructions_rect)
     
@@ -126,8 +128,8 @@ class DifficultyMenu:
     
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, 72)
-        self.font_option = pygame.font.Font(None, 48)
+        self.font_title = get_font(72)
+        self.font_option = get_font(48)
         
         self.selected_option = 0
         self.options = [
@@ -141,7 +143,7 @@ class DifficultyMenu:
         self.screen.fill(BLACK)
         
         # Título
-        title = self.font_title.render("SELECCIONA DIFICULTAD", True, NEON_GREEN)
+        title = render_text(self.font_title, "SELECCIONA DIFICULTAD", True, NEON_GREEN)
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 100))
         self.screen.blit(title, title_rect)
         
@@ -151,7 +153,7 @@ class DifficultyMenu:
             is_selected = i == self.selected_option
             color = NEON_GREEN if is_selected else WHITE
             
-            option_text = self.font_option.render(option["text"], True, color)
+            option_text = render_text(self.font_option, option["text"], True, color)
             option_rect = option_text.get_rect(center=(WINDOW_WIDTH // 2, option_start_y + i * 80))
             
             if is_selected:
@@ -183,9 +185,9 @@ class ScoreMenu:
     
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, 72)
-        self.font_option = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
+        self.font_title = get_font(72)
+        self.font_option = get_font(48)
+        self.font_small = get_font(32)
         
         self.selected_option = 0
         self.options = [
@@ -202,7 +204,7 @@ class ScoreMenu:
         self.screen.fill(BLACK)
         
         # Título
-        title = self.font_title.render("SELECCIONA PUNTUAJE", True, NEON_GREEN)
+        title = render_text(self.font_title, "SELECCIONA PUNTUAJE", True, NEON_GREEN)
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 80))
         self.screen.blit(title, title_rect)
         
@@ -212,7 +214,7 @@ class ScoreMenu:
             is_selected = i == self.selected_option
             color = NEON_GREEN if is_selected else WHITE
             
-            option_text = self.font_option.render(option["text"], True, color)
+            option_text = render_text(self.font_option, option["text"], True, color)
             option_rect = option_text.get_rect(center=(WINDOW_WIDTH // 2, option_start_y + i * 70))
             
             if is_selected:
@@ -223,7 +225,7 @@ class ScoreMenu:
             self.screen.blit(option_text, option_rect)
         
         # Instrucciones
-        instructions = self.font_small.render("↑/↓ Seleccionar | ENTER Confirmar", True, GRAY)
+        instructions = render_text(self.font_small, "↑/↓ Seleccionar | ENTER Confirmar", True, GRAY)
         instructions_rect = instructions.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 40))
         self.screen.blit(instructions, instructions_rect)
     
@@ -252,15 +254,17 @@ class OnlineRoleMenu:
     
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(None, 72)
-        self.font_option = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
+        self.font_title = get_font(72)
+        self.font_option = get_font(48)
+        self.font_small = get_font(32)
         
         self.selected_option = 0
         self.local_ip = get_local_ip()
         self.options = [
             {"text": "SER HOST (SERVIDOR)", "role": "host"},
-            {"text": "UNIRSE A PARTIDA", "role": "client"}
+            {"text": "UNIRSE A PARTIDA", "role": "client"},
+            {"text": "P2P ROLLBACK: SER HOST", "role": "p2p_host"},
+            {"text": "P2P ROLLBACK: UNIRSE", "role": "p2p_client"}
         ]
     
     def draw(self):
@@ -268,12 +272,12 @@ class OnlineRoleMenu:
         self.screen.fill(BLACK)
         
         # Título
-        title = self.font_title.render("MULTIJUGADOR ONLINE", True, NEON_GREEN)
+        title = render_text(self.font_title, "MULTIJUGADOR ONLINE", True, NEON_GREEN)
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 80))
         self.screen.blit(title, title_rect)
         
         # Mostrar IP local
-        ip_text = self.font_small.render(f"Tu IP: {self.local_ip}", True, CYAN)
+        ip_text = render_text(self.font_small, f"Tu IP: {self.local_ip}", True, CYAN)
         ip_rect = ip_text.get_rect(center=(WINDOW_WIDTH // 2, 160))
         self.screen.blit(ip_text, ip_rect)
         
@@ -281,13 +285,13 @@ class OnlineRoleMenu:
         pygame.draw.line(self.screen, GRAY, (100, 200), (WINDOW_WIDTH - 100, 200), 1)
         
         # Opciones
-        option_start_y = 280
+        option_start_y = 270
         for i, option in enumerate(self.options):
             is_selected = i == self.selected_option
             color = NEON_GREEN if is_selected else WHITE
             
-            option_text = self.font_option.render(option["text"], True, color)
-            option_rect = option_text.get_rect(center=(WINDOW_WIDTH // 2, option_start_y + i * 100))
+            option_text = render_text(self.font_option, option["text"], True, color)
+            option_rect = option_text.get_rect(center=(WINDOW_WIDTH // 2, option_start_y + i * 90))
             
             if is_selected:
                 pygame.draw.rect(self.screen, color, 
@@ -297,7 +301,7 @@ class OnlineRoleMenu:
             self.screen.blit(option_text, option_rect)
         
         # Instrucciones
-        instructions = self.font_small.render("↑/↓ Seleccionar | ENTER Confirmar | ESC Atrás", True, GRAY)
+        instructions = render_text(self.font_small, "↑/↓ Seleccionar | ENTER Confirmar | ESC Atrás", True, GRAY)
         instructions_rect = instructions.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 40))
         self.screen.blit(instructions, instructions_rect)
     
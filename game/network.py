@@ -4,35 +4,74 @@
 # ============================================
 
 import socket
-import pickle
+import selectors
 import threading
 import time
+from collections import deque
 from game.config import *
+from game.protocol import (
+    FrameReader, ProtocolError, InputMessage,
+    MSG_WELCOME, MSG_INPUT, MSG_JOIN, MSG_SNAPSHOT, MSG_SNAPSHOT_DELTA, MSG_ERROR, MSG_SCORE,
+    encode_welcome, encode_input, encode_join, encode_score, apply_snapshot_delta,
+)
+from game.replay import new_replay_path
+from game.session import MatchSession
+from game.simulation import EVENT_GOAL, TickInput
+from game.udp import UdpChannel
+from game.physics import fold_into_range
 
 
 class NetworkClient:
-    """Cliente de red para multijugador online"""
+    """Cliente de red para multijugador online
     
-    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    Con `transport=TRANSPORT_UDP` se une por UDP y, si el servidor no
+    responde en UDP_CONNECT_TIMEOUT, vuelve a intentarlo por TCP.
+    """
+    
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, room="", transport=NETWORK_TRANSPORT):
         self.host = host
         self.port = port
+        self.room = room  # Sala del servidor de partidas ("" = cualquiera libre)
+        self.transport = transport
         self.socket = None
+        self.channel = None  # UdpChannel si la conexión es UDP
         self.connected = False
         self.player_id = None
+        self.max_score = MAX_SCORE
+        self.tick_rate = SERVER_TICK_RATE
         self.receive_thread = None
         self.running = False
-        self.last_data = None
+        self.last_snapshot = None
+        self.last_score = None
+        self.input_seq = 0
+        self.pending_inputs = deque(maxlen=INPUT_HISTORY_SIZE)  # Entradas sin confirmar
+        self.reconciled_snapshot = None
+        self.snapshot_buffer = deque(maxlen=SNAPSHOT_BUFFER_SIZE)  # (hora de llegada, estado)
+        self.interpolation_delay = INTERPOLATION_DELAY
+        self.max_extrapolation = MAX_EXTRAPOLATION
+        self.reader = FrameReader()
         self.lock = threading.Lock()
     
     def connect(self):
         """Conecta al servidor"""
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(NETWORK_TIMEOUT)
-            self.socket.connect((self.host, self.port))
+            messages = None
+            if self.transport == TRANSPORT_UDP:
+                messages = self._join_udp()
+                if messages is None:
+                    print(f"UDP sin respuesta en {self.host}:{self.port}, usando TCP")
+            if messages is None:
+                messages = self._join_tcp()
             
-            # Recibir ID del jugador
-            self.player_id = pickle.loads(self.socket.recv(BUFFER_SIZE))
+            msg_type, message = messages[0]
+            if msg_type == MSG_ERROR:
+                raise ConnectionError(message)
+            if msg_type != MSG_WELCOME:
+                raise ProtocolError("Se esperaba el mensaje de bienvenida")
+            self.player_id = message.player_id
+            self.max_score = message.max_score
+            self.tick_rate = message.tick_rate
+            self._handle_messages(messages[1:])
             
             self.connected = True
             self.running = True
@@ -56,45 +95,162 @@ class NetworkClient:
             self.connected = False
             return False
     
+    def _join_tcp(self):
+        """Se une por TCP; retorna los primeros mensajes recibidos"""
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.settimeout(NETWORK_TIMEOUT)
+        self.socket.connect((self.host, self.port))
+        
+        # Pedir sala (el servidor de un solo match lo ignora)
+        self.socket.sendall(encode_join(self.room))
+        
+        # Recibir ID del jugador (puede llegar junto con otros mensajes)
+        self.reader = FrameReader()
+        messages = []
+        while not messages:
+            data = self.socket.recv(BUFFER_SIZE)
+            if not data:
+                raise ConnectionError("El servidor cerró la conexión")
+            messages = self.reader.feed(data)
+        return messages
+    
+    def _join_udp(self):
+        """Se une por UDP; retorna los primeros mensajes o None si no hay respuesta"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.settimeout(RELIABLE_RESEND_INTERVAL)
+        channel = UdpChannel((self.host, self.port))
+        channel.queue_reliable(encode_join(self.room))
+        deadline = time.perf_counter() + UDP_CONNECT_TIMEOUT
+        
+        try:
+            sock.connect((self.host, self.port))
+            while time.perf_counter() < deadline:
+                sock.send(channel.build_packet())  # Repite la unión hasta la bienvenida
+                try:
+                    messages = channel.receive_packet(sock.recv(MAX_DATAGRAM_SIZE))
+                except socket.timeout:
+                    continue
+                if messages:
+                    self.socket = sock
+                    self.channel = channel
+                    return messages
+        except (ConnectionRefusedError, ProtocolError):
+            pass  # Nadie escucha UDP en ese puerto (o no habla este protocolo)
+        
+        sock.close()
+        return None
+    
     def disconnect(self):
         """Desconecta del servidor"""
         self.running = False
         self.connected = False
         
         if self.socket:
+            # shutdown despierta al thread bloqueado en recv y manda el FIN ya;
+            # con solo close() el servidor no se entera hasta su timeout
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass  # Ya desconectado (o UDP sin conexión real)
             try:
                 self.socket.close()
-            except:
+            except OSError:
                 pass
     
-    def send_data(self, data):
-        """Envía datos al servidor"""
+    def send_input(self, direction, tick=0):
+        """Envía al servidor la entrada de la paleta; retorna su número de secuencia"""
         if not self.connected:
-            return False
+            return None
         
+        self.input_seq += 1
+        snapshot = self.last_snapshot
+        snapshot_tick = snapshot.tick if snapshot is not None else 0  # Confirma la base de los deltas
         try:
-            self.socket.sendall(pickle.dumps(data))
-            return True
+            self._send(encode_input(InputMessage(self.input_seq, tick, direction, snapshot_tick)))
+            return self.input_seq
         except Exception as e:
             print(f"Error enviando datos: {e}")
             self.connected = False
-            return False
+            return None
+    
+    def _send(self, data):
+        """Envía mensajes enmarcados (no fiables si la conexión es UDP)"""
+        if self.channel is None:
+            self.socket.sendall(data)
+            return
+        with self.lock:
+            packet = self.channel.build_packet(data)
+        self.socket.send(packet)
     
-    def get_data(self):
-        """Obtiene datos recibidos"""
+    def get_score(self):
+        """Último marcador recibido por el canal fiable (ScoreMessage o None)"""
         with self.lock:
-            data = self.last_data
-            self.last_data = None
-        return data
+            return self.last_score
+    
+    def get_snapshot(self):
+        """Obtiene el último estado autoritativo recibido (o None)"""
+        with self.lock:
+            return self.last_snapshot
+    
+    def predict(self, direction, simulation):
+        """Predicción local: envía la entrada y la aplica de inmediato
+        
+        Cada entrada enviada se guarda en `pending_inputs` hasta que el
+        servidor la confirma (ack_seq). Al llegar un estado nuevo se copia en
+        `simulation` y se vuelven a simular las entradas aún no confirmadas, de
+        modo que la paleta propia responde sin esperar al servidor.
+        Retorna los eventos del tick predicho.
+        """
+        seq = self.send_input(direction, tick=simulation.tick)
+        if seq is None:
+            return []
+        self.pending_inputs.append(InputMessage(seq, simulation.tick, direction))
+        
+        snapshot = self.get_snapshot()
+        if snapshot is None:
+            return []  # La partida empieza con el primer estado del servidor
+        if snapshot is not self.reconciled_snapshot:
+            self._reconcile(simulation, snapshot)
+        
+        return simulation.step(self._make_tick_input(direction, simulation))
+    
+    def _reconcile(self, simulation, snapshot):
+        """Aplica el estado del servidor y re-simula las entradas pendientes"""
+        self.reconciled_snapshot = snapshot
+        while self.pending_inputs and self.pending_inputs[0].seq <= snapshot.ack_seq:
+            self.pending_inputs.popleft()
+        
+        trail = simulation.ball.trail.copy()
+        simulation.apply_snapshot(snapshot)
+        
+        # La última entrada pendiente es la del tick que se está prediciendo
+        for message in list(self.pending_inputs)[:-1]:
+            simulation.step(self._make_tick_input(message.direction, simulation))
+        
+        # El rastro es visual: conservar uno por frame y no los ticks re-simulados
+        simulation.ball.trail = trail
+    
+    def _make_tick_input(self, direction, simulation):
+        """Entrada de un tick: la propia y una estimación de la del rival"""
+        # Se supone que el rival sigue moviéndose como en el último estado
+        remote = simulation.paddle2 if self.player_id == 1 else simulation.paddle1
+        remote_direction = max(-1.0, min(1.0, remote.velocity / remote.max_velocity))
+        
+        if self.player_id == 1:
+            return TickInput(p1=direction, p2=remote_direction)
+        return TickInput(p1=remote_direction, p2=direction)
     
     def _receive_loop(self):
         """Loop de recepción en thread separado"""
+        if self.channel is not None:
+            self._receive_loop_udp()
+            return
+        
         while self.running and self.connected:
             try:
                 data = self.socket.recv(BUFFER_SIZE)
                 if data:
-                    with self.lock:
-                        self.last_data = pickle.loads(data)
+                    self._handle_messages(self.reader.feed(data))
                 else:
                     self.connected = False
                     break
@@ -106,21 +262,155 @@ class NetworkClient:
                 self.connected = False
                 break
     
+    def _receive_loop_udp(self):
+        """Recepción UDP: también reenvía fiables, manda keepalives y detecta silencio"""
+        channel = self.channel
+        while self.running and self.connected:
+            try:
+                data = self.socket.recv(MAX_DATAGRAM_SIZE)
+                with self.lock:
+                    messages = channel.receive_packet(data)
+                self._handle_messages(messages)
+            except (socket.timeout, ProtocolError):
+                pass  # Datagramas corruptos se ignoran: el siguiente trae el estado
+            except Exception as e:
+                if self.running:  # Tras disconnect() el socket cerrado no es un error
+                    print(f"Error recibiendo datos: {e}")
+                self.connected = False
+                break
+            
+            now = time.perf_counter()
+            if now - channel.last_receive_time > NETWORK_TIMEOUT:
+                print("Error: el servidor dejó de responder")
+                self.connected = False
+                break
+            if channel.needs_send(now):
+                try:
+                    self._send(b"")
+                except OSError:
+                    pass
+    
+    def _handle_messages(self, messages):
+        """Guarda el estado autoritativo más reciente"""
+        with self.lock:
+            for msg_type, message in messages:
+                if msg_type == MSG_SCORE:
+                    if self.last_score is None or message.tick >= self.last_score.tick:
+                        self.last_score = message
+                    continue
+                
+                if msg_type == MSG_SNAPSHOT_DELTA:
+                    baseline = self._find_snapshot(message.baseline_tick)
+                    if baseline is None:
+                        continue  # Sin base no se puede reconstruir; llegará otro estado
+                    msg_type, message = MSG_SNAPSHOT, apply_snapshot_delta(baseline, message)
+                
+                if msg_type == MSG_SNAPSHOT:
+                    if self.last_snapshot is None or message.tick > self.last_snapshot.tick:
+                        self.last_snapshot = message
+                        self.snapshot_buffer.append((time.perf_counter(), message))
+    
+    def _find_snapshot(self, tick):
+        """Busca en el búfer el estado recibido de un tick (o None)"""
+        for _, snapshot in reversed(self.snapshot_buffer):
+            if snapshot.tick == tick:
+                return snapshot
+        return None
+    
+    def get_interpolated_snapshot(self, now=None):
+        """Estado para dibujar entidades remotas, `interpolation_delay` en el pasado
+        
+        Interpola entre los dos estados del búfer que rodean el instante a
+        dibujar. Si aún no llegó un estado posterior se extrapola con las
+        velocidades, como mucho `max_extrapolation` segundos.
+        """
+        with self.lock:
+            buffer = list(self.snapshot_buffer)
+        if not buffer:
+            return None
+        
+        if now is None:
+            now = time.perf_counter()
+        rate = self.tick_rate
+        
+        # Reloj del servidor estimado con el estado que llegó con menos retraso
+        offset = min(arrival * rate - snapshot.tick for arrival, snapshot in buffer)
+        render_tick = now * rate - offset - self.interpolation_delay * rate
+        
+        if render_tick <= buffer[0][1].tick:
+            return buffer[0][1]
+        
+        for (_, older), (_, newer) in zip(buffer, buffer[1:]):
+            if older.tick <= render_tick <= newer.tick:
+                return _interpolate_snapshot(older, newer, render_tick)
+        
+        newest = buffer[-1][1]
+        ahead = min(render_tick - newest.tick, self.max_extrapolation * rate)
+        return _extrapolate_snapshot(newest, ahead)
+    
     def is_connected(self):
         """Verifica si está conectado"""
         return self.connected and self.socket is not None
 
 
+def _interpolate_snapshot(older, newer, tick):
+    """Mezcla lineal de dos estados para un tick intermedio"""
+    alpha = (tick - older.tick) / (newer.tick - older.tick) if newer.tick > older.tick else 1.0
+    
+    def lerp(field):
+        a = getattr(older, field)
+        return a + (getattr(newer, field) - a) * alpha
+    
+    # Tras un punto la pelota vuelve al centro: no interpolar ese salto
+    scored = (older.score1, older.score2) != (newer.score1, newer.score2)
+    ball = newer if scored else None
+    return newer._replace(
+        tick=tick,
+        ball_x=ball.ball_x if ball else lerp("ball_x"),
+        ball_y=ball.ball_y if ball else lerp("ball_y"),
+        paddle1_y=lerp("paddle1_y"),
+        paddle2_y=lerp("paddle2_y"),
+    )
+
+
+def _extrapolate_snapshot(snapshot, ticks):
+    """Avanza un estado `ticks` ticks con sus velocidades (sin fricción)"""
+    half = BALL_SIZE // 2
+    max_y = WINDOW_HEIGHT - PADDLE_HEIGHT
+    return snapshot._replace(
+        tick=snapshot.tick + ticks,
+        ball_x=snapshot.ball_x + snapshot.ball_vx * ticks,
+        ball_y=fold_into_range(snapshot.ball_y + snapshot.ball_vy * ticks, half, WINDOW_HEIGHT - half),
+        paddle1_y=max(0, min(max_y, snapshot.paddle1_y + snapshot.paddle1_velocity * ticks)),
+        paddle2_y=max(0, min(max_y, snapshot.paddle2_y + snapshot.paddle2_velocity * ticks)),
+    )
+
+
 class NetworkServer:
-    """Servidor de red para multijugador"""
+    """Servidor de red para multijugador
     
-    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    Escucha en TCP y, con `udp=True`, también en UDP en el mismo puerto;
+    cada jugador usa el transporte con el que se unió.
+    """
+    
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_score=MAX_SCORE,
+                 tick_rate=SERVER_TICK_RATE, snapshot_rate=SNAPSHOT_RATE, udp=True, replay_dir=None):
         self.host = host
         self.port = port
+        self.max_score = max_score
+        self.tick_rate = tick_rate
+        self.snapshot_rate = snapshot_rate
+        self.replay_dir = replay_dir  # Directorio donde grabar la partida (None = no grabar)
         self.server_socket = None
+        self.udp = udp
+        self.udp_socket = None
+        self.udp_addresses = {}  # dirección -> id de jugador
+        self.player_counter = 1
         self.clients = {}
         self.running = False
         self.accept_thread = None
+        self.session = None
+        self.stats = {"ticks": 0, "overruns": 0, "dropped_ticks": 0, "max_tick_time": 0.0}
     
     def start(self):
         """Inicia el servidor"""
@@ -130,6 +420,11 @@ class NetworkServer:
             self.server_socket.bind((self.host, self.port))
             self.server_socket.listen(2)
             
+            if self.udp:
+                self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self.udp_socket.bind((self.host, self.port))
+                self.udp_socket.setblocking(False)
+            
             self.running = True
             
             # Thread para aceptar conexiones
@@ -145,82 +440,281 @@ class NetworkServer:
             return False
     
     def _accept_connections(self):
-        """Acepta conexiones de clientes"""
-        player_counter = 1
-        self.server_socket.settimeout(1.0)  # Timeout de 1 segundo
+        """Acepta conexiones de clientes (TCP y UDP)"""
+        selector = selectors.DefaultSelector()
+        selector.register(self.server_socket, selectors.EVENT_READ)
+        if self.udp_socket is not None:
+            selector.register(self.udp_socket, selectors.EVENT_READ)
         
-        while self.running and len(self.clients) < 2:
-            try:
-                client_socket, address = self.server_socket.accept()
-                player_id = player_counter
-                player_counter += 1
-                
-                # Enviar ID al cliente
-                client_socket.send(pickle.dumps(player_id))
-                
-                # Guardar cliente
-                self.clients[player_id] = {
-                    "socket": client_socket,
-                    "address": address,
-                    "data": None
-                }
+        try:
+            while self.running and len(self.clients) < 2:
+                for key, _ in selector.select(RELIABLE_RESEND_INTERVAL):
+                    if key.fileobj is self.udp_socket:
+                        self._receive_udp()
+                    else:
+                        self._accept_tcp()
                 
-                print(f"[SERVIDOR] Jugador {player_id} conectado desde {address}")
+                # Reenviar bienvenidas sin confirmar y mantener vivos a los de UDP
+                self._check_udp_timeouts()
+                for player_id in list(self.clients):
+                    if "channel" in self.clients[player_id]:
+                        self._flush_client(player_id)
+        except OSError as e:
+            if self.running:
+                print(f"Error aceptando conexión: {e}")
+        finally:
+            selector.close()
+        
+        # Si hay 2 jugadores, iniciar el loop de juego
+        if self.running and len(self.clients) == 2:
+            self._game_loop()
+    
+    def _accept_tcp(self):
+        """Acepta un cliente TCP y le envía la bienvenida"""
+        try:
+            client_socket, address = self.server_socket.accept()
+            player_id = self.player_counter
+            self.player_counter += 1
+            
+            # Enviar ID y reglas de la partida al cliente
+            client_socket.sendall(encode_welcome(player_id, self.max_score, self.tick_rate))
+            
+            # Guardar cliente
+            self.clients[player_id] = {
+                "socket": client_socket,
+                "address": address,
+                "reader": FrameReader()
+            }
+            
+            print(f"[SERVIDOR] Jugador {player_id} conectado desde {address}")
+        
+        except Exception as e:
+            if self.running:
+                print(f"Error aceptando conexión: {e}")
+    
+    def _receive_udp(self):
+        """Lee todos los datagramas pendientes; un MSG_JOIN de una dirección nueva la une"""
+        while True:
+            try:
+                data, address = self.udp_socket.recvfrom(MAX_DATAGRAM_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                print(f"Error recibiendo por UDP: {e}")
+                return
+            
+            player_id = self.udp_addresses.get(address)
+            channel = self.clients[player_id]["channel"] if player_id else UdpChannel(address)
+            try:
+                messages = channel.receive_packet(data)
+            except ProtocolError:
+                continue  # Datagrama ajeno o corrupto
+            
+            if player_id is None:
+                if not any(msg_type == MSG_JOIN for msg_type, _ in messages):
+                    continue
+                if len(self.clients) >= 2:
+                    channel.queue_reliable(encode_error("La partida está llena"))
+                    self.udp_socket.sendto(channel.build_packet(), address)
+                    continue
                 
-                # Si hay 2 jugadores, iniciar el loop de juego
-                if len(self.clients) == 2:
-                    self._game_loop()
+                player_id = self.player_counter
+                self.player_counter += 1
+                channel.queue_reliable(encode_welcome(player_id, self.max_score, self.tick_rate))
+                self.clients[player_id] = {"channel": channel, "address": address, "outbox": bytearray()}
+                self.udp_addresses[address] = player_id
+                print(f"[SERVIDOR] Jugador {player_id} conectado por UDP desde {address}")
+                self._flush_client(player_id)
             
-            except socket.timeout:
-                continue
-            except Exception as e:
-                if self.running:
-                    print(f"Error aceptando conexión: {e}")
+            # Los clientes solo envían entradas
+            for msg_type, message in messages:
+                if msg_type == MSG_INPUT and self.session is not None:
+                    self.session.add_input(player_id, message)
+    
+    def _check_udp_timeouts(self):
+        """Desconecta a los clientes UDP que llevan NETWORK_TIMEOUT sin enviar nada"""
+        now = time.perf_counter()
+        for player_id, client_info in list(self.clients.items()):
+            channel = client_info.get("channel")
+            if channel is not None and now - channel.last_receive_time > NETWORK_TIMEOUT:
+                print(f"[SERVIDOR] Jugador {player_id} sin respuesta por UDP")
+                self._disconnect_client(player_id)
     
     def _game_loop(self):
-        """Loop principal de sincronización del juego"""
-        while self.running and len(self.clients) == 2:
-            try:
-                for player_id, client_info in list(self.clients.items()):
-                    try:
-                        data = client_info["socket"].recv(BUFFER_SIZE)
-                        if data:
-                            client_info["data"] = pickle.loads(data)
-                        else:
-                            self._disconnect_client(player_id)
-                    
-                    except socket.timeout:
-                        continue
-                    except Exception as e:
-                        print(f"Error recibiendo de jugador {player_id}: {e}")
-                        self._disconnect_client(player_id)
+        """Loop principal: simulación autoritativa a ritmo fijo
+        
+        Usa un selector para leer de los sockets que tengan datos sin
+        bloquearse en ninguno, y un acumulador de tiempo para ejecutar los
+        ticks a `tick_rate` exacto aunque un cliente sea lento. Si el servidor
+        se atrasa recupera hasta MAX_CATCHUP_TICKS y descarta el resto,
+        contándolo como desborde.
+        """
+        replay_path = new_replay_path("host", self.replay_dir) if self.replay_dir is not None else None
+        self.session = MatchSession(max_score=self.max_score, tick_rate=self.tick_rate,
+                                    snapshot_rate=self.snapshot_rate, replay_path=replay_path)
+        selector = selectors.DefaultSelector()
+        for player_id, client_info in self.clients.items():
+            client_info["outbox"] = bytearray()
+            if "socket" in client_info:
+                client_info["socket"].setblocking(False)
+                selector.register(client_info["socket"], selectors.EVENT_READ, player_id)
+        if self.udp_socket is not None:
+            selector.register(self.udp_socket, selectors.EVENT_READ, None)
+        
+        interval = 1 / self.tick_rate
+        previous = time.perf_counter()
+        accumulator = 0.0
+        last_report = previous
+        
+        try:
+            while self.running and len(self.clients) == 2:
+                # Esperar datos solo hasta que toque el siguiente tick
+                for key, _ in selector.select(max(0.0, interval - accumulator)):
+                    if key.data is None:
+                        self._receive_udp()
+                    else:
+                        self._drain_client(key.data, selector)
+                self._check_udp_timeouts()
                 
-                # Enviar datos de ambos jugadores a cada cliente
-                if len(self.clients) == 2:
-                    game_state = {
-                        1: self.clients.get(1, {}).get("data"),
-                        2: self.clients.get(2, {}).get("data")
-                    }
-                    
-                    for player_id, client_info in self.clients.items():
-                        try:
-                            client_info["socket"].sendall(pickle.dumps(game_state))
-                        except:
-                            self._disconnect_client(player_id)
+                now = time.perf_counter()
+                accumulator += now - previous
+                previous = now
                 
-                time.sleep(1 / FPS)
-            
+                # Ejecutar los ticks pendientes
+                send = False
+                ticks = 0
+                while accumulator >= interval and ticks < MAX_CATCHUP_TICKS:
+                    if not self.session.is_game_over():
+                        events, tick_send = self.session.step()
+                        send = send or tick_send
+                        if any(event[0] == EVENT_GOAL for event in events):
+                            self._send_score()
+                    accumulator -= interval
+                    ticks += 1
+                    self.stats["ticks"] += 1
+                
+                if accumulator >= interval:
+                    dropped = int(accumulator / interval)
+                    accumulator -= dropped * interval
+                    self.stats["overruns"] += 1
+                    self.stats["dropped_ticks"] += dropped
+                
+                tick_time = time.perf_counter() - now
+                self.stats["max_tick_time"] = max(self.stats["max_tick_time"], tick_time)
+                
+                # Enviar el estado autoritativo y vaciar lo pendiente
+                if send and len(self.clients) == 2:
+                    for player_id in list(self.clients):
+                        self._queue_send(player_id, self.session.encode_snapshot(player_id))
+                for player_id in list(self.clients):
+                    self._flush_client(player_id, selector)
+                
+                # Reportar desbordes como mucho una vez por segundo
+                if self.stats["overruns"] and now - last_report >= 1.0:
+                    print(f"[SERVIDOR] Ticks atrasados: {self.stats['overruns']} desbordes, "
+                          f"{self.stats['dropped_ticks']} ticks descartados, "
+                          f"peor tick {self.stats['max_tick_time'] * 1000:.1f} ms")
+                    self.stats["overruns"] = 0
+                    self.stats["dropped_ticks"] = 0
+                    last_report = now
+        
+        except Exception as e:
+            print(f"Error en game_loop: {e}")
+        finally:
+            selector.close()
+            self.session.close()
+    
+    def _drain_client(self, player_id, selector):
+        """Lee todo lo disponible de un cliente sin bloquear"""
+        client_info = self.clients.get(player_id)
+        if client_info is None:
+            return
+        
+        while True:
+            try:
+                data = client_info["socket"].recv(BUFFER_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return
             except Exception as e:
-                print(f"Error en game_loop: {e}")
+                print(f"Error recibiendo de jugador {player_id}: {e}")
+                data = b""
+            
+            if not data:
+                selector.unregister(client_info["socket"])
+                self._disconnect_client(player_id)
+                return
+            
+            try:
+                # Los clientes solo envían entradas
+                for msg_type, message in client_info["reader"].feed(data):
+                    if msg_type == MSG_INPUT:
+                        self.session.add_input(player_id, message)
+            except ProtocolError as e:
+                print(f"Error de protocolo de jugador {player_id}: {e}")
+                selector.unregister(client_info["socket"])
+                self._disconnect_client(player_id)
+                return
+    
+    def _send_score(self):
+        """Envía el marcador a ambos jugadores por el canal fiable"""
+        frame = encode_score(self.session.score())
+        for player_id, client_info in self.clients.items():
+            if "channel" in client_info:
+                client_info["channel"].queue_reliable(frame)
+            else:
+                self._queue_send(player_id, frame)  # TCP ya es fiable
+    
+    def _queue_send(self, player_id, data):
+        """Encola un mensaje completo; se descarta si el cliente va muy atrasado"""
+        outbox = self.clients[player_id]["outbox"]
+        if len(outbox) + len(data) <= MAX_PENDING_BYTES:
+            outbox.extend(data)
+    
+    def _flush_client(self, player_id, selector=None):
+        """Envía lo que el socket acepte sin bloquear"""
+        client_info = self.clients.get(player_id)
+        if client_info is None:
+            return
+        
+        channel = client_info.get("channel")
+        if channel is not None:
+            # UDP: un datagrama con lo pendiente; si se pierde, el siguiente estado lo reemplaza
+            outbox = client_info["outbox"]
+            if outbox or channel.needs_send(time.perf_counter()):
+                try:
+                    self.udp_socket.sendto(channel.build_packet(bytes(outbox)), client_info["address"])
+                except OSError:
+                    pass
+                outbox.clear()
+            return
+        
+        if not client_info["outbox"]:
+            return
+        
+        try:
+            sent = client_info["socket"].send(client_info["outbox"])
+            del client_info["outbox"][:sent]
+        except (BlockingIOError, InterruptedError):
+            pass
+        except Exception:
+            selector.unregister(client_info["socket"])
+            self._disconnect_client(player_id)
+    
+    def get_stats(self):
+        """Retorna estadísticas del loop de ticks (ticks, desbordes, peor tick)"""
+        return dict(self.stats)
     
     def _disconnect_client(self, player_id):
         """Desconecta un cliente"""
         if player_id in self.clients:
-            try:
-                self.clients[player_id]["socket"].close()
-            except:
-                pass
-            del self.clients[player_id]
+            client_info = self.clients.pop(player_id)
+            if "channel" in client_info:
+                self.udp_addresses.pop(client_info["address"], None)
+            else:
+                try:
+                    client_info["socket"].close()
+                except:
+                    pass
             print(f"[SERVIDOR] Jugador {player_id} desconectado")
     
     def get_connected_clients(self):
@@ -239,11 +733,12 @@ class NetworkServer:
         for player_id in list(self.clients.keys()):
             self._disconnect_client(player_id)
         
-        # Cerrar socket del servidor
-        if self.server_socket:
-            try:
-                self.server_socket.close()
-            except:
-                pass
+        # Cerrar sockets del servidor
+        for server_socket in (self.server_socket, self.udp_socket):
+            if server_socket:
+                try:
+                    server_socket.close()
+                except:
+                    pass
         
         print("[SERVIDOR] Detenido")
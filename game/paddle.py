@@ -3,7 +3,6 @@
 # Clase Paleta
 # ============================================
 
-import pygame
 from game.config import *
 
 
@@ -27,6 +26,7 @@ class Paddle:
         
         if keys is not None:
             # Movimiento con teclado
+            import pygame
             if keys[pygame.K_UP] or keys[pygame.K_w]:
                 target_velocity = -self.max_velocity
             elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
@@ -59,6 +59,8 @@ class Paddle:
     
     def draw(self, screen, color=WHITE):
         """Dibuja la paleta"""
+        import pygame
+        
         # Paleta principal
         pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
         
@@ -74,9 +76,14 @@ class Paddle:
                         (self.x, self.y + mid),
                         (self.x + self.width, self.y + mid), 1)
     
+    def get_bounds(self):
+        """Retorna rectángulo de colisión (x, y, ancho, alto) sin pygame"""
+        return (int(self.x), int(self.y), self.width, self.height)
+    
     def get_rect(self):
         """Retorna rectángulo de colisión"""
-        return pygame.Rect(self.x, self.y, self.width, self.height)
+        import pygame
+        return pygame.Rect(self.get_bounds())
     
     def get_center(self):
         """Retorna centro de la paleta"""
@@ -88,6 +95,7 @@ class Paddle:
             y = WINDOW_HEIGHT // 2 - self.height // 2
         self.y = y
         self.velocity = 0
+        self.glow_intensity = 0
     
     def collides_with(self, rect):
         """Verifica colisión con otro rectángulo"""
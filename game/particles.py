@@ -0,0 +1,134 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Sistema de Partículas (pool de capacidad fija con NumPy)
+# ============================================
+
+import math
+import numpy as np
+import pygame
+from game.config import *
+
+
+PARTICLE_GRAVITY = 0.2
+PARTICLE_FRICTION = 0.98
+PARTICLE_MAX_RADIUS = 4
+PARTICLE_MIN_RADIUS = 2
+
+
+class ParticlePool:
+    """Todas las partículas vivas en arrays de NumPy de tamaño fijo
+    
+    Las partículas vivas ocupan siempre las primeras `count` posiciones:
+    `update()` las mueve todas a la vez y rellena los huecos de las que se
+    apagan con las vivas del final (swap-remove), así que no se crean ni se
+    destruyen objetos por frame. Si el pool está lleno las nuevas se
+    descartan. Los colores se guardan como índice de una paleta.
+    """
+    
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.max_lifetime = np.ones(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        
+        self.palette = []       # índice -> color
+        self._color_index = {}  # color -> índice
+        self._sprites = {}      # (índice de color, radio) -> superficie
+    
+    def __len__(self):
+        return self.count
+    
+    def clear(self):
+        """Apaga todas las partículas"""
+        self.count = 0
+    
+    def emit(self, x, y, vx, vy, color, lifetime=PARTICLE_LIFETIME):
+        """Añade partículas en (x, y) con las velocidades de los arrays `vx`, `vy`"""
+        start = self.count
+        end = min(start + len(vx), self.capacity)
+        added = end - start
+        if added <= 0:
+            return 0
+        
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = vx[:added]
+        self.vy[start:end] = vy[:added]
+        self.lifetime[start:end] = lifetime
+        self.max_lifetime[start:end] = lifetime
+        self.color[start:end] = self._palette_index(color)
+        self.count = end
+        return added
+    
+    def burst(self, x, y, color, count=8):
+        """Anillo regular de partículas de colisión"""
+        angles = np.arange(count) * (2 * math.pi / count)
+        return self.emit(x, y, np.cos(angles) * 3, np.sin(angles) * 3, color)
+    
+    def update(self):
+        """Mueve todas las partículas un tick y retira las que se apagan"""
+        n = self.count
+        if n == 0:
+            return
+        
+        x, y, vx, vy, lifetime = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.lifetime[:n]
+        x += vx
+        y += vy
+        vy += PARTICLE_GRAVITY
+        lifetime -= 1
+        vx *= PARTICLE_FRICTION
+        
+        dead = lifetime <= 0
+        if dead.any():
+            self._compact(dead)
+    
+    def _compact(self, dead):
+        """Swap-remove vectorizado: las vivas del final ocupan los huecos"""
+        alive_count = self.count - int(np.count_nonzero(dead))
+        holes = np.flatnonzero(dead[:alive_count])
+        movers = alive_count + np.flatnonzero(~dead[alive_count:])
+        if len(holes):
+            for array in (self.x, self.y, self.vx, self.vy, self.lifetime, self.max_lifetime, self.color):
+                array[holes] = array[movers]
+        self.count = alive_count
+    
+    def draw(self, screen):
+        """Dibuja todas las partículas con un solo `blits` de sprites pre-dibujados"""
+        n = self.count
+        if n == 0:
+            return
+        
+        # El radio encoge con la vida restante, como un círculo de 4 a 2 px
+        fraction = self.lifetime[:n] / self.max_lifetime[:n]
+        radius = np.maximum(PARTICLE_MIN_RADIUS, (PARTICLE_MAX_RADIUS * fraction).astype(np.int32))
+        left = self.x[:n].astype(np.int32) - radius
+        top = self.y[:n].astype(np.int32) - radius
+        
+        sprites = self._sprites
+        screen.blits([
+            (sprites.get((color, r)) or self._sprite(color, r), (px, py))
+            for color, r, px, py in zip(self.color[:n].tolist(), radius.tolist(), left.tolist(), top.tolist())
+        ], doreturn=False)
+    
+    def _palette_index(self, color):
+        """Índice de `color` en la paleta (lo añade si es nuevo)"""
+        color = tuple(color)
+        index = self._color_index.get(color)
+        if index is None:
+            if len(self.palette) >= 256:
+                raise ValueError("ParticlePool admite como mucho 256 colores")
+            index = self._color_index[color] = len(self.palette)
+            self.palette.append(color)
+        return index
+    
+    def _sprite(self, color, radius):
+        """Círculo de un color y radio, dibujado una sola vez"""
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, self.palette[color], (radius, radius), radius)
+        self._sprites[(color, radius)] = surface
+        return surface
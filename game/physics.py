@@ -0,0 +1,100 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Física y Colisiones (sin pygame)
+# ============================================
+
+import math
+from game.config import *
+
+
+def rects_overlap(rect_a, rect_b):
+    """Verifica si dos rectángulos (x, y, ancho, alto) se solapan
+    
+    Misma semántica que pygame.Rect.colliderect: los bordes que solo se tocan
+    no cuentan como colisión y los rectángulos vacíos nunca colisionan.
+    """
+    ax, ay, aw, ah = rect_a
+    bx, by, bw, bh = rect_b
+    if aw <= 0 or ah <= 0 or bw <= 0 or bh <= 0:
+        return False
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def check_collision(ball, paddle):
+    """Verifica colisión entre pelota y paleta"""
+    return rects_overlap(ball.get_bounds(), paddle.get_bounds())
+
+
+def handle_ball_collision(ball, paddle, from_left=True, tick=0):
+    """Maneja colisión realista de pelota con paleta
+    
+    `tick` es el tick actual de la simulación; el antirrebote se mide en ticks
+    para que el resultado no dependa de la velocidad a la que se simula.
+    """
+    if check_collision(ball, paddle):
+        # Evitar colisiones múltiples
+        if tick - ball.last_collision_tick < COLLISION_COOLDOWN_TICKS:
+            return False
+        
+        ball.last_collision_tick = tick
+        
+        # Posicionar la pelota fuera de la paleta
+        if from_left:
+            ball.x = paddle.x + paddle.width + ball.size + 2
+        else:
+            ball.x = paddle.x - ball.size - 2
+        
+        # Calcular ángulo según donde golpee la paleta (0.0 = arriba, 1.0 = abajo)
+        hit_pos = (ball.y - paddle.y) / paddle.height
+        hit_pos = max(0.0, min(1.0, hit_pos))  # Limitar entre 0 y 1
+        
+        # Convertir a ángulo (-70 a 70 grados) para mayor variedad
+        angle = (hit_pos - 0.5) * 140  # rango de -70 a 70
+        angle_rad = math.radians(angle)
+        
+        # Velocidad base aumentada con bonus según la velocidad de la paleta
+        paddle_velocity = abs(paddle.velocity) if hasattr(paddle, 'velocity') else 0
+        velocity_bonus = 1.0 + (paddle_velocity / paddle.max_velocity) * 0.5 if hasattr(paddle, 'max_velocity') else 1.0
+        
+        # Base speed + bonus
+        base_speed = MAX_BALL_SPEED * 0.9 * velocity_bonus
+        
+        # Aplicar ángulo a la velocidad
+        ball.speed_x = math.cos(angle_rad) * base_speed
+        ball.speed_y = math.sin(angle_rad) * base_speed
+        
+        # Invertir dirección X según el lado que golpea
+        if from_left:
+            ball.speed_x = abs(ball.speed_x)  # Hacia la derecha
+        else:
+            ball.speed_x = -abs(ball.speed_x)  # Hacia la izquierda
+        
+        # Asegurar velocidad mínima horizontal
+        min_x_speed = MAX_BALL_SPEED * 0.7
+        if abs(ball.speed_x) < min_x_speed:
+            ball.speed_x = min_x_speed if ball.speed_x > 0 else -min_x_speed
+        
+        # Limitar velocidad máxima
+        speed = math.sqrt(ball.speed_x ** 2 + ball.speed_y ** 2)
+        if speed > MAX_BALL_SPEED:
+            ratio = MAX_BALL_SPEED / speed
+            ball.speed_x *= ratio
+            ball.speed_y *= ratio
+        
+        return True
+    return False
+
+
+def fold_into_range(value, low, high):
+    """Refleja `value` dentro de [low, high] como si rebotara en ambos bordes
+    
+    Equivale a simular los rebotes uno a uno pero en O(1): la trayectoria
+    desplegada es periódica con periodo 2 * (high - low).
+    """
+    span = high - low
+    if span <= 0:
+        return low
+    offset = (value - low) % (2 * span)
+    if offset > span:
+        offset = 2 * span - offset
+    return low + offset
@@ -0,0 +1,138 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Perfilador de Frames (tiempo por fase y percentiles)
+# ============================================
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from game.config import *
+
+
+# Fases de un frame, en el orden en que ocurren
+PHASES = (
+    "events",      # Eventos de pygame
+    "update",      # Lectura de entradas y red antes de simular
+    "ai",          # AI.update
+    "physics",     # Paletas y pelota
+    "collisions",  # Colisiones y puntos
+    "particles",   # Actualizar y dibujar partículas
+    "background",  # Fondo
+    "entities",    # Pelota y paletas
+    "scoreboard",  # Marcador
+    "hud",         # Textos de pausa/espera/cuenta atrás y el propio overlay
+    "flip",        # pygame.display.flip
+)
+
+
+def _percentile(ordered, fraction):
+    """Percentil de una lista ya ordenada (interpolación lineal)"""
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+class FrameProfiler:
+    """Mide cuánto tarda cada fase de cada frame
+    
+    El bucle llama a `begin_frame()`, luego a `mark(fase)` al terminar cada
+    fase (el tiempo desde la marca anterior se suma a esa fase; una fase
+    puede marcarse varias veces por frame, p. ej. al re-simular en rollback)
+    y a `end_frame()` antes de esperar al reloj. Guarda una ventana de
+    PROFILE_WINDOW frames para los percentiles y una traza de los últimos
+    PROFILE_TRACE_FRAMES para volcar a CSV o JSON.
+    """
+    
+    def __init__(self, window=PROFILE_WINDOW, trace_frames=PROFILE_TRACE_FRAMES):
+        self.window = {phase: deque(maxlen=window) for phase in PHASES + ("frame",)}
+        self.trace = deque(maxlen=trace_frames)
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame = 0
+        self.frame_start = self.last = time.perf_counter()
+        self.summary = {}
+        self.font = None
+    
+    def begin_frame(self):
+        """Empieza a medir un frame"""
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = self.last = time.perf_counter()
+    
+    def mark(self, phase):
+        """Suma a `phase` el tiempo transcurrido desde la marca anterior"""
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+    
+    def end_frame(self):
+        """Cierra el frame: guarda sus tiempos en la ventana y en la traza"""
+        total = time.perf_counter() - self.frame_start
+        self.frame += 1
+        for phase, seconds in self.current.items():
+            self.window[phase].append(seconds)
+        self.window["frame"].append(total)
+        self.trace.append((self.frame, total, *self.current.values()))
+        
+        # Los percentiles se recalculan unas veces por segundo, no en cada frame
+        if self.frame % PROFILE_SUMMARY_INTERVAL == 0 or not self.summary:
+            self.summary = self.percentiles()
+    
+    def percentiles(self):
+        """{fase: (p50, p95, p99)} en milisegundos sobre la ventana actual"""
+        summary = {}
+        for phase, samples in self.window.items():
+            ordered = sorted(samples)
+            summary[phase] = tuple(_percentile(ordered, q) * 1000 for q in (0.5, 0.95, 0.99))
+        return summary
+    
+    def dump(self, path):
+        """Vuelca la traza (ms por fase y frame) a CSV o, si termina en .json, a JSON"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        columns = ("frame", "total") + PHASES
+        rows = [(row[0],) + tuple(round(value * 1000, 4) for value in row[1:]) for row in self.trace]
+        
+        if path.endswith(".json"):
+            with open(path, "w") as file:
+                json.dump({
+                    "columns": columns,
+                    "frames": rows,
+                    "percentiles_ms": {phase: dict(zip(("p50", "p95", "p99"), values))
+                                       for phase, values in self.percentiles().items()},
+                }, file)
+        else:
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(columns)
+                writer.writerows(rows)
+        return path
+    
+    def draw(self, screen):
+        """Dibuja el overlay con p50/p95/p99 de cada fase (en ms)"""
+        import pygame
+        from game.fonts import get_font
+        if self.font is None:
+            self.font = get_font(20)
+        
+        rows = [("fase", "p50", "p95", "p99")]
+        for phase in ("frame",) + PHASES:
+            rows.append((phase,) + tuple(f"{value:.2f}" for value in self.summary.get(phase, (0.0, 0.0, 0.0))))
+        
+        line_height = 16
+        panel = pygame.Surface((220, line_height * len(rows) + 10))
+        panel.set_alpha(190)
+        panel.fill(BLACK)
+        screen.blit(panel, (12, 12))
+        
+        # El total en rojo si su p95 no entra en el tiempo de un frame
+        slow = self.summary.get("frame", (0.0, 0.0, 0.0))[1] > 1000 / FPS
+        for i, row in enumerate(rows):
+            color = YELLOW if i == 0 else (RED if i == 1 and slow else WHITE)
+            y = 17 + i * line_height
+            screen.blit(self.font.render(row[0], True, color), (18, y))
+            for column, value in enumerate(row[1:]):
+                text = self.font.render(value, True, color)
+                screen.blit(text, text.get_rect(topright=(135 + column * 45, y)))
@@ -0,0 +1,263 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Protocolo Binario de Red
+# ============================================
+
+import operator
+import struct
+from collections import namedtuple
+
+
+# Cabecera de cada mensaje: magia, versión, tipo y longitud del contenido
+PROTOCOL_MAGIC = b"PP"
+PROTOCOL_VERSION = 4
+HEADER = struct.Struct("!2sBBH")
+
+# Tipos de mensaje
+MSG_WELCOME = 1   # servidor -> cliente: id del jugador y reglas de la partida
+MSG_INPUT = 2     # cliente -> servidor: entrada de la paleta en un tick
+MSG_JOIN = 3      # cliente -> servidor: nombre de la sala (vacío = cualquiera)
+MSG_ERROR = 4     # servidor -> cliente: texto del error antes de cerrar
+MSG_SNAPSHOT = 5  # servidor -> cliente: estado autoritativo de la simulación
+MSG_SNAPSHOT_DELTA = 6  # servidor -> cliente: campos que cambiaron respecto a un estado confirmado
+MSG_SCORE = 7     # servidor -> cliente: marcador tras un punto y ganador al terminar (fiable)
+MSG_PEER_INPUTS = 8  # par <-> par: entradas de varios ticks seguidos (rollback P2P)
+MSG_PEER_START = 9   # anfitrión -> invitado: id, reglas y semilla de la partida P2P
+
+MAX_ROOM_NAME = 32
+
+_WELCOME = struct.Struct("!BHH")
+_INPUT = struct.Struct("!IIbI")
+_SNAPSHOT = struct.Struct("!IIffffffffHH")
+_SCORE = struct.Struct("!IHHB")
+_PEER_INPUTS = struct.Struct("!IIB")  # primer tick, último tick confirmado del par, cantidad
+_PEER_START = struct.Struct("!BHI")
+MAX_PEER_INPUTS = 255
+_DELTA_HEADER = struct.Struct("!IBIH")  # tick, distancia al estado base, ack_seq, máscara
+_DELTA_VALUE = struct.Struct("!h")
+
+# Campos de estado que viajan en los deltas y su escala de cuantización:
+# posiciones a 1/8 de píxel y velocidades a 1/256 de píxel por tick
+SNAPSHOT_FIELDS = (
+    ("ball_x", 8), ("ball_y", 8), ("ball_vx", 256), ("ball_vy", 256),
+    ("paddle1_y", 8), ("paddle1_velocity", 256),
+    ("paddle2_y", 8), ("paddle2_velocity", 256),
+    ("score1", 1), ("score2", 1),
+)
+MAX_DELTA_DISTANCE = 255  # Ticks máximos entre un delta y su estado base
+_SCALES = tuple(scale for _, scale in SNAPSHOT_FIELDS)
+
+WelcomeMessage = namedtuple("WelcomeMessage", ["player_id", "max_score", "tick_rate"])
+
+# Entrada de un jugador: número de secuencia, tick del cliente, dirección (-1, 0, 1)
+# y tick del último estado recibido (base para los deltas del servidor)
+InputMessage = namedtuple("InputMessage", ["seq", "tick", "direction", "snapshot_tick"], defaults=(0,))
+
+# Estado autoritativo; `ack_seq` es la última entrada del destinatario ya simulada
+SnapshotMessage = namedtuple("SnapshotMessage", [
+    "tick", "ack_seq",
+    "ball_x", "ball_y", "ball_vx", "ball_vy",
+    "paddle1_y", "paddle1_velocity", "paddle2_y", "paddle2_velocity",
+    "score1", "score2",
+])
+
+# Marcador en un tick; `winner` es 0 mientras la partida sigue
+ScoreMessage = namedtuple("ScoreMessage", ["tick", "score1", "score2", "winner"])
+
+# Entradas P2P: dirección de los ticks start_tick, start_tick + 1, ...
+# `ack_tick` es el último tick del par recibido sin huecos
+PeerInputsMessage = namedtuple("PeerInputsMessage", ["start_tick", "ack_tick", "directions"])
+
+PeerStartMessage = namedtuple("PeerStartMessage", ["player_id", "max_score", "seed"])
+
+# Delta sin aplicar: `changes` son los campos presentes en la máscara
+SnapshotDelta = namedtuple("SnapshotDelta", ["tick", "baseline_tick", "ack_seq", "changes"])
+
+
+class ProtocolError(ValueError):
+    """Mensaje mal formado o de una versión incompatible"""
+
+
+def _frame(msg_type, payload):
+    """Antepone la cabecera a un contenido ya empaquetado"""
+    return HEADER.pack(PROTOCOL_MAGIC, PROTOCOL_VERSION, msg_type, len(payload)) + payload
+
+
+def encode_welcome(player_id, max_score, tick_rate):
+    """Codifica el mensaje de bienvenida con el id del jugador"""
+    return _frame(MSG_WELCOME, _WELCOME.pack(player_id, max_score, tick_rate))
+
+
+def encode_join(room=""):
+    """Codifica la petición de unirse a una sala"""
+    name = room.encode("utf-8")
+    if len(name) > MAX_ROOM_NAME:
+        raise ProtocolError(f"Nombre de sala demasiado largo (máx. {MAX_ROOM_NAME} bytes)")
+    return _frame(MSG_JOIN, name)
+
+
+def encode_error(text):
+    """Codifica un mensaje de error para el cliente"""
+    return _frame(MSG_ERROR, text.encode("utf-8")[:255])
+
+
+def encode_input(message):
+    """Codifica un InputMessage (o tupla con los mismos campos)"""
+    return _frame(MSG_INPUT, _INPUT.pack(*message))
+
+
+def encode_snapshot(message):
+    """Codifica un SnapshotMessage (o tupla con los mismos campos)"""
+    return _frame(MSG_SNAPSHOT, _SNAPSHOT.pack(*message))
+
+
+def encode_score(message):
+    """Codifica un ScoreMessage (o tupla con los mismos campos)"""
+    return _frame(MSG_SCORE, _SCORE.pack(*message))
+
+
+def encode_peer_inputs(message):
+    """Codifica un PeerInputsMessage (como mucho MAX_PEER_INPUTS direcciones)"""
+    count = len(message.directions)
+    if count > MAX_PEER_INPUTS:
+        raise ProtocolError(f"Demasiadas entradas en un mensaje: {count}")
+    header = _PEER_INPUTS.pack(message.start_tick, message.ack_tick, count)
+    return _frame(MSG_PEER_INPUTS, header + struct.pack(f"!{count}b", *message.directions))
+
+
+def encode_peer_start(message):
+    """Codifica un PeerStartMessage"""
+    return _frame(MSG_PEER_START, _PEER_START.pack(*message))
+
+
+def _decode_peer_inputs(payload):
+    """Decodifica un PeerInputsMessage"""
+    start_tick, ack_tick, count = _PEER_INPUTS.unpack_from(payload)
+    directions = struct.unpack(f"!{count}b", payload[_PEER_INPUTS.size:])
+    return PeerInputsMessage(start_tick, ack_tick, directions)
+
+
+def quantize_snapshot(message):
+    """Campos de estado (SNAPSHOT_FIELDS) como tupla de enteros en la rejilla de los deltas
+    
+    El servidor cuantiza cada estado una sola vez y guarda la tupla: los
+    deltas comparan enteros y el estado completo se envía ya redondeado
+    (dequantize_snapshot), así su copia de cada estado base es idéntica a la
+    que reconstruye el cliente. Los valores se limitan a 16 bits.
+    """
+    values = tuple(map(round, map(operator.mul, message[2:], _SCALES)))
+    if max(values) > 32767 or min(values) < -32768:
+        values = tuple([max(-32768, min(32767, value)) for value in values])
+    return values
+
+
+def dequantize_snapshot(tick, ack_seq, values):
+    """SnapshotMessage con los valores de una tupla de quantize_snapshot"""
+    return SnapshotMessage(tick, ack_seq, *[
+        value / scale if scale > 1 else value
+        for value, scale in zip(values, _SCALES)
+    ])
+
+
+def encode_snapshot_delta(tick, ack_seq, values, baseline_tick, baseline_values):
+    """Codifica solo los campos de `values` que cambiaron respecto a `baseline_values`
+    
+    Ambas son tuplas de quantize_snapshot; el estado base debe ser uno que
+    el cliente ya confirmó haber recibido.
+    """
+    distance = tick - baseline_tick
+    if not 0 < distance <= MAX_DELTA_DISTANCE:
+        raise ProtocolError(f"Estado base fuera de rango: {distance} ticks")
+    
+    mask = 0
+    changed = []
+    for bit, (value, base) in enumerate(zip(values, baseline_values)):
+        if value != base:
+            mask |= 1 << bit
+            changed.append(value)
+    
+    header = _DELTA_HEADER.pack(tick, distance, ack_seq, mask)
+    return _frame(MSG_SNAPSHOT_DELTA, header + struct.pack(f"!{len(changed)}h", *changed))
+
+
+def _decode_snapshot_delta(payload):
+    """Decodifica un delta; los campos ausentes se toman luego del estado base"""
+    tick, distance, ack_seq, mask = _DELTA_HEADER.unpack_from(payload)
+    offset = _DELTA_HEADER.size
+    changes = {}
+    for bit, (field, scale) in enumerate(SNAPSHOT_FIELDS):
+        if mask & (1 << bit):
+            value, = _DELTA_VALUE.unpack_from(payload, offset)
+            offset += _DELTA_VALUE.size
+            changes[field] = value / scale if scale > 1 else value
+    if offset != len(payload) or mask >> len(SNAPSHOT_FIELDS):
+        raise struct.error("longitud del delta incorrecta")
+    return SnapshotDelta(tick, tick - distance, ack_seq, changes)
+
+
+def apply_snapshot_delta(baseline, delta):
+    """Reconstruye el SnapshotMessage completo a partir de su estado base"""
+    if baseline.tick != delta.baseline_tick:
+        raise ProtocolError(f"El delta requiere el estado {delta.baseline_tick}, no {baseline.tick}")
+    return baseline._replace(tick=delta.tick, ack_seq=delta.ack_seq, **delta.changes)
+
+
+def decode_payload(msg_type, payload):
+    """Decodifica el contenido de un mensaje según su tipo"""
+    try:
+        if msg_type == MSG_WELCOME:
+            return WelcomeMessage._make(_WELCOME.unpack(payload))
+        if msg_type == MSG_INPUT:
+            return InputMessage._make(_INPUT.unpack(payload))
+        if msg_type == MSG_SNAPSHOT:
+            return SnapshotMessage._make(_SNAPSHOT.unpack(payload))
+        if msg_type == MSG_SNAPSHOT_DELTA:
+            return _decode_snapshot_delta(payload)
+        if msg_type == MSG_SCORE:
+            return ScoreMessage._make(_SCORE.unpack(payload))
+        if msg_type == MSG_PEER_INPUTS:
+            return _decode_peer_inputs(payload)
+        if msg_type == MSG_PEER_START:
+            return PeerStartMessage._make(_PEER_START.unpack(payload))
+        if msg_type in (MSG_JOIN, MSG_ERROR):
+            return payload.decode("utf-8")
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ProtocolError(f"Contenido inválido para el tipo {msg_type}: {e}")
+    raise ProtocolError(f"Tipo de mensaje desconocido: {msg_type}")
+
+
+class FrameReader:
+    """Reensambla mensajes a partir de un flujo TCP
+    
+    TCP no conserva los límites de los mensajes: un `recv` puede traer medio
+    mensaje o varios juntos. Se acumulan los bytes y se extraen los mensajes
+    completos usando la longitud de la cabecera.
+    """
+    
+    def __init__(self):
+        self.buffer = bytearray()
+    
+    def feed(self, data):
+        """Agrega bytes recibidos y retorna la lista de (tipo, mensaje) completos"""
+        self.buffer.extend(data)
+        messages = []
+        offset = 0
+        size = len(self.buffer)
+        
+        while size - offset >= HEADER.size:
+            magic, version, msg_type, length = HEADER.unpack_from(self.buffer, offset)
+            if magic != PROTOCOL_MAGIC:
+                raise ProtocolError("Cabecera inválida")
+            if version != PROTOCOL_VERSION:
+                raise ProtocolError(f"Versión de protocolo no soportada: {version}")
+            end = offset + HEADER.size + length
+            if end > size:
+                break
+            payload = bytes(self.buffer[offset + HEADER.size:end])
+            messages.append((msg_type, decode_payload(msg_type, payload)))
+            offset = end
+        
+        if offset:
+            del self.buffer[:offset]
+        return messages
+
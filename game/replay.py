@@ -0,0 +1,309 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Repeticiones: grabación y reproducción de partidas
+# ============================================
+
+import bisect
+import os
+import queue
+import struct
+import threading
+import time
+from game.config import *
+from game.simulation import Simulation, TickInput, STATE_SIZE
+
+
+# Formato del archivo (little endian, solo se agregan registros al final):
+#   cabecera: magia, versión, modo, dificultad, puntos para ganar, semilla, ticks entre estados
+#   registros: tipo, tick, cantidad y su contenido
+#     REC_INPUTS   entradas de `cantidad` ticks desde `tick`, un nibble por tick
+#                  (2 bits por paleta: 0 arriba, 1 quieto, 2 abajo)
+#     REC_KEYFRAME estado completo (Simulation.save_state) al final de `tick`
+# Un registro cortado al final (partida interrumpida) se ignora al leer.
+REPLAY_MAGIC = b"PPRP"
+REPLAY_VERSION = 1
+_HEADER = struct.Struct("<4sBBBHIH")
+_RECORD = struct.Struct("<BIH")
+REC_INPUTS = 1
+REC_KEYFRAME = 2
+
+_MODES = (MODE_SINGLE_PLAYER, MODE_LOCAL_MULTIPLAYER, MODE_ONLINE, MODE_P2P)
+_DIFFICULTIES = (DIFFICULTY_EASY, DIFFICULTY_NORMAL, DIFFICULTY_HARD)
+
+
+class ReplayError(ValueError):
+    """Archivo de repetición inválido o de una versión incompatible"""
+
+
+def _encode_direction(direction):
+    """Dirección de una paleta (-1, 0, 1) en 2 bits"""
+    if direction not in (-1, 0, 1):
+        raise ReplayError(f"Dirección no grabable: {direction}")
+    return int(direction) + 1
+
+
+def new_replay_path(label, directory=REPLAY_DIR):
+    """Ruta para una repetición nueva: <directorio>/<etiqueta>-<fecha y hora>.ppr"""
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"{label}-{stamp}.ppr")
+    counter = 1
+    while os.path.exists(path):
+        counter += 1
+        path = os.path.join(directory, f"{label}-{stamp}-{counter}.ppr")
+    return path
+
+
+class ReplayWriter:
+    """Escribe bytes en un archivo desde un hilo propio
+    
+    `write()` solo encola: el loop de juego nunca espera al disco.
+    """
+    
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+    
+    def write(self, data):
+        """Encola bytes para escribir"""
+        self.queue.put(bytes(data))
+    
+    def close(self):
+        """Escribe lo pendiente y cierra el archivo"""
+        self.queue.put(None)
+        self.thread.join()
+    
+    def _write_loop(self):
+        """Hilo de escritura: vuelca cada bloque en cuanto llega"""
+        try:
+            while True:
+                data = self.queue.get()
+                if data is None:
+                    break
+                self.file.write(data)
+                self.file.flush()
+        finally:
+            self.file.close()
+
+
+class ReplayRecorder:
+    """Graba una partida: entradas de cada tick y estados completos periódicos
+    
+    Se llama a `record()` después de cada `Simulation.step()` con las mismas
+    entradas. Las entradas se acumulan en memoria y cada `keyframe_interval`
+    ticks se entregan al escritor junto con el estado de ese tick.
+    """
+    
+    def __init__(self, simulation, path, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.simulation = simulation
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.writer = ReplayWriter(path)
+        self.pending = bytearray()  # Un byte por tick: p1 | p2 << 2
+        self.block_tick = simulation.tick + 1
+        self.closed = False
+        
+        self.writer.write(_HEADER.pack(
+            REPLAY_MAGIC, REPLAY_VERSION,
+            _MODES.index(simulation.mode), _DIFFICULTIES.index(simulation.difficulty),
+            simulation.max_score, simulation.seed, keyframe_interval,
+        ))
+        self._write_keyframe()
+    
+    def record(self, inputs):
+        """Agrega las entradas del tick que se acaba de simular"""
+        if self.closed:
+            return
+        self.pending.append(_encode_direction(inputs.p1) | _encode_direction(inputs.p2) << 2)
+        if self.simulation.tick % self.keyframe_interval == 0:
+            self.flush()
+    
+    def flush(self):
+        """Entrega al escritor las entradas acumuladas y el estado actual"""
+        if not self.pending:
+            return
+        pending, count = self.pending, len(self.pending)
+        if count % 2:
+            pending.append(0)
+        packed = bytes(pending[i] | pending[i + 1] << 4 for i in range(0, count, 2))
+        self.writer.write(_RECORD.pack(REC_INPUTS, self.block_tick, count) + packed)
+        self.pending = bytearray()
+        self.block_tick += count
+        self._write_keyframe()
+    
+    def close(self):
+        """Graba lo pendiente (con el estado final) y cierra el archivo"""
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        self.writer.close()
+    
+    def _write_keyframe(self):
+        """Encola el estado completo del tick actual"""
+        sim = self.simulation
+        self.writer.write(_RECORD.pack(REC_KEYFRAME, sim.tick, STATE_SIZE) + sim.save_state())
+
+
+class Replay:
+    """Repetición cargada en memoria"""
+    
+    def __init__(self, mode, difficulty, max_score, seed, keyframe_interval):
+        self.mode = mode
+        self.difficulty = difficulty
+        self.max_score = max_score
+        self.seed = seed
+        self.keyframe_interval = keyframe_interval
+        self.inputs = []      # inputs[t - 1] = TickInput del tick t
+        self.keyframes = {}   # tick -> estado guardado al final de ese tick
+        self.keyframe_ticks = []
+    
+    @property
+    def last_tick(self):
+        """Último tick grabado"""
+        return len(self.inputs)
+    
+    @classmethod
+    def load(cls, path):
+        """Lee un archivo .ppr"""
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < _HEADER.size:
+            raise ReplayError(f"{path}: archivo demasiado corto")
+        magic, version, mode, difficulty, max_score, seed, interval = _HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ReplayError(f"{path}: no es una repetición")
+        if version != REPLAY_VERSION:
+            raise ReplayError(f"{path}: versión no soportada {version}")
+        
+        replay = cls(_MODES[mode], _DIFFICULTIES[difficulty], max_score, seed, interval)
+        offset = _HEADER.size
+        while offset + _RECORD.size <= len(data):
+            rec_type, tick, count = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size
+            size = (count + 1) // 2 if rec_type == REC_INPUTS else count
+            if start + size > len(data):
+                break  # Registro incompleto: la grabación se cortó aquí
+            body = data[start:start + size]
+            offset = start + size
+            
+            if rec_type == REC_INPUTS:
+                if tick != replay.last_tick + 1:
+                    raise ReplayError(f"{path}: entradas fuera de orden en el tick {tick}")
+                for i in range(count):
+                    code = body[i // 2] >> (4 * (i % 2))
+                    replay.inputs.append(TickInput(p1=(code & 3) - 1, p2=(code >> 2 & 3) - 1))
+            elif rec_type == REC_KEYFRAME:
+                if count != STATE_SIZE:
+                    raise ReplayError(f"{path}: estado de tamaño {count}, se esperaba {STATE_SIZE}")
+                if tick <= replay.last_tick:
+                    replay.keyframes[tick] = body
+            else:
+                raise ReplayError(f"{path}: registro desconocido {rec_type}")
+        
+        if 0 not in replay.keyframes:
+            raise ReplayError(f"{path}: falta el estado inicial")
+        replay.keyframe_ticks = sorted(replay.keyframes)
+        return replay
+    
+    def create_simulation(self):
+        """Simulación con las reglas y la semilla de la partida grabada"""
+        return Simulation(mode=self.mode, difficulty=self.difficulty, max_score=self.max_score, seed=self.seed)
+
+
+class ReplayPlayer:
+    """Reproduce una repetición tick a tick y salta a cualquier tick
+    
+    `seek()` restaura el estado completo más cercano anterior al tick pedido
+    y re-simula desde ahí, así que cuesta como mucho `keyframe_interval` ticks.
+    """
+    
+    def __init__(self, replay):
+        if isinstance(replay, (str, os.PathLike)):
+            replay = Replay.load(replay)
+        self.replay = replay
+        self.simulation = replay.create_simulation()
+        self.seek(0)
+    
+    @property
+    def tick(self):
+        """Tick actual de la reproducción"""
+        return self.simulation.tick
+    
+    def is_finished(self):
+        """Verifica si se llegó al final de lo grabado"""
+        return self.simulation.tick >= self.replay.last_tick
+    
+    def step(self):
+        """Avanza un tick con las entradas grabadas; retorna sus eventos"""
+        if self.is_finished():
+            return []
+        return self.simulation.step(self.replay.inputs[self.simulation.tick])
+    
+    def seek(self, tick):
+        """Coloca la simulación al final del tick pedido (limitado a lo grabado)"""
+        replay = self.replay
+        tick = max(0, min(tick, replay.last_tick))
+        sim = self.simulation
+        
+        # Si el tick está adelante y antes del próximo estado, basta con avanzar
+        index = bisect.bisect_right(replay.keyframe_ticks, tick) - 1
+        keyframe = replay.keyframe_ticks[index]
+        if not keyframe <= sim.tick <= tick:
+            sim.load_state(replay.keyframes[keyframe])
+            sim.ball.trail.clear()
+        while sim.tick < tick:
+            sim.step(replay.inputs[sim.tick])
+
+
+def _score(simulation):
+    """Marcador de una simulación como tupla"""
+    return simulation.scoreboard.player1_score, simulation.scoreboard.player2_score
+
+
+def verify_replay(path):
+    """Re-simula una repetición desde su semilla y la compara con lo grabado
+    
+    No restaura ningún estado intermedio: si la física cambió, el resultado
+    se aparta de la grabación. Es "divergent" si algún estado guardado no
+    coincide o si la partida termina en otro tick que la grabada. Retorna un
+    dict con `status` ("ok", "divergent" o "error"), el marcador y la huella
+    esperados y obtenidos, y el primer tick con estado distinto.
+    """
+    result = {"path": str(path), "status": "ok", "ticks": 0, "first_divergence": None}
+    try:
+        replay = Replay.load(path)
+    except (OSError, ReplayError) as e:
+        result.update(status="error", error=str(e))
+        return result
+    
+    result["ticks"] = replay.last_tick
+    final_tick = replay.keyframe_ticks[-1]
+    if final_tick != replay.last_tick:
+        result.update(status="error", error=f"{path}: falta el estado final (último en el tick {final_tick})")
+        return result
+    
+    expected = replay.create_simulation()
+    expected.load_state(replay.keyframes[final_tick])
+    sim = replay.create_simulation()
+    for tick_input in replay.inputs:
+        if sim.is_game_over():
+            break  # Con otra física la partida puede terminar antes
+        sim.step(tick_input)
+        keyframe = replay.keyframes.get(sim.tick)
+        if keyframe is not None and result["first_divergence"] is None and sim.save_state() != keyframe:
+            result["first_divergence"] = sim.tick
+    
+    result.update(
+        expected_score=_score(expected), score=_score(sim),
+        expected_hash=expected.state_hash(), hash=sim.state_hash(),
+    )
+    if result["first_divergence"] is None and (sim.tick != replay.last_tick or result["hash"] != result["expected_hash"]):
+        # Terminó antes que la grabación (p. ej. un punto cambió tras el último
+        # estado intermedio): difiere a más tardar en el tick en que se detuvo
+        result["first_divergence"] = sim.tick
+    if result["first_divergence"] is not None:
+        result["status"] = "divergent"
+    return result
@@ -0,0 +1,54 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Números Aleatorios Reproducibles por Partida
+# ============================================
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def _mix64(value):
+    """Mezcla un entero de 64 bits (finalizador de splitmix64)"""
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & _MASK
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & _MASK
+    return value ^ (value >> 31)
+
+
+class TickRandom:
+    """Generador de una partida que no guarda estado entre ticks
+    
+    Tras `seek(tick)` los números que da dependen solo de la semilla, el
+    flujo y el tick. Así se pueden restaurar estados guardados (rollback,
+    saltos en repeticiones) sin guardar también el generador, y cada
+    consumidor (IA, saques, ...) usa su propio `stream` sin afectar a los
+    demás. Implementa el subconjunto de random.Random que usa el juego.
+    """
+    
+    def __init__(self, seed, stream=0):
+        self.key = _mix64((seed * _GOLDEN + stream) & _MASK)
+        self.state = self.key
+    
+    def seek(self, tick):
+        """Coloca el generador al inicio de un tick"""
+        self.state = _mix64(self.key ^ tick * _GOLDEN & _MASK)
+    
+    def _next(self):
+        """Siguiente entero de 64 bits (splitmix64)"""
+        self.state = (self.state + _GOLDEN) & _MASK
+        return _mix64(self.state)
+    
+    def random(self):
+        """Decimal uniforme en [0, 1)"""
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+    
+    def randint(self, a, b):
+        """Entero uniforme en [a, b]"""
+        return a + self._next() % (b - a + 1)
+    
+    def uniform(self, a, b):
+        """Decimal uniforme entre a y b"""
+        return a + (b - a) * self.random()
+    
+    def choice(self, sequence):
+        """Elemento al azar de una secuencia no vacía"""
+        return sequence[self._next() % len(sequence)]
@@ -0,0 +1,339 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Rollback P2P (entradas por tick, predicción y re-simulación)
+# ============================================
+
+import random
+import socket
+import threading
+import time
+from collections import deque
+from game.config import *
+from game.protocol import (
+    ProtocolError, PeerInputsMessage, PeerStartMessage, MAX_PEER_INPUTS,
+    MSG_JOIN, MSG_PEER_INPUTS, MSG_PEER_START,
+    encode_join, encode_peer_inputs, encode_peer_start,
+)
+from game.simulation import TickInput
+from game.udp import UdpChannel
+
+
+class RollbackSession:
+    """Núcleo del rollback (estilo GGPO), sin sockets
+    
+    Cada par simula la partida completa. La entrada local se aplica en el
+    acto y la del rival se predice repitiendo la última confirmada. Antes de
+    cada tick se guarda el estado de la simulación; si después llega una
+    entrada del rival distinta de la predicha, se restaura el estado previo a
+    ese tick y se re-simulan los ticks hasta el presente.
+    
+    Los pares solo intercambian entradas (PeerInputsMessage): `outgoing()`
+    da las propias que el rival aún no confirmó y `receive()` procesa las
+    suyas. La simulación debe ser determinista y con la misma semilla.
+    """
+    
+    def __init__(self, simulation, player_id, input_delay=ROLLBACK_INPUT_DELAY, max_rollback=MAX_ROLLBACK_TICKS):
+        self.simulation = simulation
+        self.player_id = player_id
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        
+        self.local_inputs = {tick: 0 for tick in range(1, input_delay + 1)}  # tick -> dirección
+        self.local_tick = input_delay  # Último tick con entrada local
+        self.remote_inputs = {}  # tick -> dirección confirmada del rival
+        self.predicted = {}      # tick -> dirección del rival usada al simularlo
+        self.states = {}         # tick -> estado guardado antes de simularlo
+        
+        self.confirmed_tick = simulation.tick  # Último tick con entradas del rival sin huecos
+        self.peer_ack_tick = simulation.tick   # Último tick propio que el rival confirmó
+        self.rollback_tick = None  # Primer tick mal predicho, pendiente de corregir
+        self._discarded_tick = simulation.tick
+        self.stats = {"rollbacks": 0, "resimulated_ticks": 0, "stalls": 0}
+    
+    def advance(self, direction):
+        """Corrige predicciones fallidas y avanza un tick con la entrada local
+        
+        Retorna los eventos del tick, o None si hay que esperar al rival
+        (demasiados ticks sin confirmar o final de partida sin confirmar).
+        """
+        sim = self.simulation
+        self.rollback()
+        
+        if sim.is_game_over() or sim.tick - self.confirmed_tick >= self.max_rollback:
+            self.stats["stalls"] += 1
+            return None
+        
+        input_tick = sim.tick + 1 + self.input_delay
+        self.local_inputs[input_tick] = direction
+        self.local_tick = input_tick
+        return self._step()
+    
+    def receive(self, message):
+        """Procesa un PeerInputsMessage del rival"""
+        self.peer_ack_tick = max(self.peer_ack_tick, message.ack_tick)
+        
+        for offset, direction in enumerate(message.directions):
+            tick = message.start_tick + offset
+            if tick <= self.confirmed_tick or tick in self.remote_inputs:
+                continue
+            
+            self.remote_inputs[tick] = direction
+            predicted = self.predicted.get(tick)
+            if predicted is not None and predicted != direction:
+                if self.rollback_tick is None or tick < self.rollback_tick:
+                    self.rollback_tick = tick
+        
+        while self.confirmed_tick + 1 in self.remote_inputs:
+            self.confirmed_tick += 1
+        self._discard_old()
+    
+    def outgoing(self):
+        """Entradas propias que el rival aún no confirmó"""
+        start = self.peer_ack_tick + 1
+        end = min(self.local_tick, start + MAX_PEER_INPUTS - 1)
+        directions = tuple(self.local_inputs[tick] for tick in range(start, end + 1))
+        return PeerInputsMessage(start, self.confirmed_tick, directions)
+    
+    def is_confirmed(self):
+        """Verifica si el estado actual ya no puede cambiar por un rollback"""
+        return self.rollback_tick is None and self.confirmed_tick >= self.simulation.tick
+    
+    def _remote_input(self, tick):
+        """Entrada del rival en un tick: la confirmada o la última conocida"""
+        if tick in self.remote_inputs:
+            return self.remote_inputs[tick]
+        return self.remote_inputs.get(self.confirmed_tick, 0)
+    
+    def _step(self):
+        """Guarda el estado y simula el siguiente tick"""
+        sim = self.simulation
+        tick = sim.tick + 1
+        self.states[tick] = sim.save_state()
+        
+        local = self.local_inputs[tick]
+        remote = self._remote_input(tick)
+        self.predicted[tick] = remote
+        
+        if self.player_id == 1:
+            return sim.step(TickInput(p1=local, p2=remote))
+        return sim.step(TickInput(p1=remote, p2=local))
+    
+    def rollback(self):
+        """Si hubo una predicción fallida, vuelve a ese tick y re-simula hasta el presente"""
+        tick, self.rollback_tick = self.rollback_tick, None
+        sim = self.simulation
+        if tick is None or tick > sim.tick:
+            return
+        
+        present = sim.tick
+        trail = sim.ball.trail.copy()
+        sim.load_state(self.states[tick])
+        while sim.tick < present:
+            self._step()
+        
+        # El rastro es visual: no mostrar los ticks re-simulados
+        sim.ball.trail = trail
+        self.stats["rollbacks"] += 1
+        self.stats["resimulated_ticks"] += present - tick + 1
+    
+    def _discard_old(self):
+        """Libera entradas y estados que ya no pueden hacer falta"""
+        limit = self.confirmed_tick
+        if self.rollback_tick is not None:
+            limit = min(limit, self.rollback_tick - 1)
+        for tick in range(self._discarded_tick + 1, limit):
+            self.states.pop(tick, None)
+            self.predicted.pop(tick, None)
+            self.remote_inputs.pop(tick, None)
+        self._discarded_tick = max(self._discarded_tick, limit - 1)
+        
+        # Las propias se guardan hasta que el rival las confirme
+        keep = min(limit, self.peer_ack_tick + 1)
+        for tick in [tick for tick in self.local_inputs if tick < keep]:
+            del self.local_inputs[tick]
+
+
+class RollbackPeer:
+    """Conexión UDP directa entre dos jugadores para el modo rollback
+    
+    Tiene la misma interfaz de conexión que NetworkClient (connect,
+    disconnect, is_connected, player_id, max_score) y, en el anfitrión,
+    get_connected_clients() como NetworkServer, para reutilizar las
+    pantallas de espera. El anfitrión es el jugador 1 y elige la semilla.
+    """
+    
+    def __init__(self, host=None, port=DEFAULT_PORT, max_score=MAX_SCORE):
+        self.host = host  # None = anfitrión
+        self.port = port
+        self.max_score = max_score
+        self.player_id = 1 if host is None else 2
+        self.seed = random.randrange(2 ** 32) if host is None else None
+        
+        self.socket = None
+        self.channel = None
+        self.connected = False
+        self.running = False
+        self.receive_thread = None
+        self.session = None
+        self.inbox = deque()
+        self.lock = threading.Lock()
+    
+    def start(self):
+        """Anfitrión: escucha en UDP hasta que se una el rival"""
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.bind(("0.0.0.0", self.port))
+            self.socket.settimeout(RELIABLE_RESEND_INTERVAL)
+        except OSError as e:
+            print(f"Error iniciando P2P: {e}")
+            return False
+        
+        self.running = True
+        self.receive_thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self.receive_thread.start()
+        print(f"[P2P] Esperando rival en el puerto {self.port}")
+        return True
+    
+    def connect(self):
+        """Invitado: se une al anfitrión y recibe id, reglas y semilla"""
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.settimeout(RELIABLE_RESEND_INTERVAL)
+            self.socket.connect((self.host, self.port))
+            channel = UdpChannel((self.host, self.port))
+            channel.queue_reliable(encode_join())
+            
+            deadline = time.perf_counter() + NETWORK_TIMEOUT
+            while time.perf_counter() < deadline:
+                self.socket.send(channel.build_packet())
+                try:
+                    messages = channel.receive_packet(self.socket.recv(MAX_DATAGRAM_SIZE))
+                except socket.timeout:
+                    continue
+                
+                for msg_type, message in messages:
+                    if msg_type == MSG_PEER_START:
+                        self.player_id = message.player_id
+                        self.max_score = message.max_score
+                        self.seed = message.seed
+                        self.channel = channel
+                        self.connected = True
+                        self.running = True
+                        self.receive_thread = threading.Thread(target=self._receive_loop, daemon=True)
+                        self.receive_thread.start()
+                        return True
+                self._queue_inputs(messages)
+            
+            print(f"Error: el anfitrión {self.host}:{self.port} no respondió")
+        except (OSError, ProtocolError) as e:
+            print(f"Error de conexión P2P: {e}")
+        
+        self.disconnect()
+        return False
+    
+    def disconnect(self):
+        """Cierra la conexión"""
+        self.running = False
+        self.connected = False
+        if self.socket:
+            try:
+                self.socket.close()
+            except OSError:
+                pass
+    
+    def is_connected(self):
+        """Verifica si hay rival conectado"""
+        return self.connected
+    
+    def get_connected_clients(self):
+        """Jugadores en la partida (el anfitrión cuenta como uno)"""
+        return 2 if self.connected else 1
+    
+    def is_started(self):
+        """Verifica si ya llegaron entradas del rival"""
+        return self.session is not None and self.session.confirmed_tick > 0
+    
+    def is_confirmed(self):
+        """Verifica si el estado actual es definitivo (sin entradas por confirmar)"""
+        return self.session is not None and self.session.is_confirmed()
+    
+    def advance(self, direction, simulation):
+        """Avanza la partida un tick con la entrada local; retorna los eventos"""
+        if self.session is None or self.session.simulation is not simulation:
+            self.session = RollbackSession(simulation, self.player_id)
+        
+        with self.lock:
+            messages, self.inbox = list(self.inbox), deque()
+        for message in messages:
+            self.session.receive(message)
+        
+        events = self.session.advance(direction)
+        self._send(encode_peer_inputs(self.session.outgoing()))
+        return events or []
+    
+    def _send(self, data):
+        """Envía mensajes enmarcados en un datagrama"""
+        if self.channel is None:
+            return
+        with self.lock:
+            packet = self.channel.build_packet(data)
+        try:
+            if self.host is None:
+                self.socket.sendto(packet, self.channel.address)
+            else:
+                self.socket.send(packet)
+        except OSError:
+            pass  # UDP: el próximo datagrama repite las entradas
+    
+    def _queue_inputs(self, messages):
+        """Deja las entradas del rival para el próximo tick"""
+        with self.lock:
+            for msg_type, message in messages:
+                if msg_type == MSG_PEER_INPUTS:
+                    self.inbox.append(message)
+    
+    def _receive_loop(self):
+        """Recibe datagramas, acepta al rival (anfitrión) y detecta silencio"""
+        while self.running:
+            try:
+                data, address = self.socket.recvfrom(MAX_DATAGRAM_SIZE)
+                self._handle_datagram(data, address)
+            except (socket.timeout, ProtocolError):
+                pass
+            except OSError as e:
+                if self.running:
+                    print(f"Error recibiendo datos: {e}")
+                self.connected = False
+                break
+            
+            channel = self.channel
+            if channel is None:
+                continue
+            now = time.perf_counter()
+            if now - channel.last_receive_time > NETWORK_TIMEOUT:
+                print("[P2P] El rival dejó de responder")
+                self.connected = False
+                break
+            if channel.needs_send(now):
+                self._send(b"")
+    
+    def _handle_datagram(self, data, address):
+        """Procesa un datagrama recibido"""
+        if self.channel is None:
+            # Anfitrión: el primer MSG_JOIN fija al rival
+            channel = UdpChannel(address)
+            messages = channel.receive_packet(data)
+            if not any(msg_type == MSG_JOIN for msg_type, _ in messages):
+                return
+            channel.queue_reliable(encode_peer_start(PeerStartMessage(2, self.max_score, self.seed)))
+            self.channel = channel
+            self.connected = True
+            print(f"[P2P] Rival conectado desde {address}")
+            self._send(b"")
+            return
+        
+        if address != self.channel.address and self.host is None:
+            return  # Datagramas de terceros
+        with self.lock:
+            messages = self.channel.receive_packet(data)
+        self._queue_inputs(messages)
@@ -3,8 +3,8 @@
 # Sistema de Puntuación
 # ============================================
 
-import pygame
 from game.config import *
+from game.text_cache import render_text
 
 
 class Scoreboard:
@@ -14,13 +14,21 @@ class Scoreboard:
         self.player1_score = 0
         self.player2_score = 0
         self.max_score = max_score
-        self.font_large = pygame.font.Font(None, 120)
-        self.font_small = pygame.font.Font(None, 32)
+        self.font_large = None  # Se cargan al dibujar (la simulación no usa fuentes)
+        self.font_small = None
         self.last_scorer = None
-        self.last_score_time = 0
+        self.last_score_tick = -SCORE_FLASH_TICKS
     
-    def update_score(self, player):
-        """Actualiza puntuación de un jugador"""
+    def _load_fonts(self):
+        """Carga las fuentes la primera vez que se dibuja"""
+        from game.fonts import get_font
+        
+        if self.font_large is None:
+            self.font_large = get_font(120)
+            self.font_small = get_font(32)
+    
+    def update_score(self, player, tick=0):
+        """Actualiza puntuación de un jugador en el tick de simulación dado"""
         if player == 1:
             self.player1_score += POINTS_PER_GOAL
             self.last_scorer = 1
@@ -28,13 +36,17 @@ class Scoreboard:
             self.player2_score += POINTS_PER_GOAL
             self.last_scorer = 2
         
-        self.last_score_time = pygame.time.get_ticks()
+        self.last_score_tick = tick
     
-    def draw(self, screen):
-        """Dibuja la puntuación en pantalla"""
+    def draw(self, screen, tick=0):
+        """Dibuja la puntuación en pantalla (tick = tick actual de la simulación)"""
+        import pygame
+        
+        self._load_fonts()
+        
         # Puntuación grande
-        p1_text = self.font_large.render(str(self.player1_score).zfill(2), True, GREEN)
-        p2_text = self.font_large.render(str(self.player2_score).zfill(2), True, BLUE)
+        p1_text = render_text(self.font_large, str(self.player1_score).zfill(2), True, GREEN)
+        p2_text = render_text(self.font_large, str(self.player2_score).zfill(2), True, BLUE)
         
         # Posicionar puntuaciones
         p1_rect = p1_text.get_rect(center=(WINDOW_WIDTH // 4, 60))
@@ -48,9 +60,8 @@ class Scoreboard:
                         (WINDOW_WIDTH // 2 + 20, 40), 2)
         
         # Indicador de último punto
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_score_time < 1000:
-            flash_alpha = 200 if (current_time // 100) % 2 == 0 else 100
+        if tick - self.last_score_tick < SCORE_FLASH_TICKS:
+            flash_alpha = 200 if (tick // (FPS // 10)) % 2 == 0 else 100
             if self.last_scorer == 1:
                 pygame.draw.circle(screen, GREEN, (WINDOW_WIDTH // 4, 60), 80, 3)
             elif self.last_scorer == 2:
@@ -58,8 +69,9 @@ class Scoreboard:
     
     def draw_match_score(self, screen):
         """Dibuja puntuación pequeña (útil para matches)"""
-        score_text = self.font_small.render(f"{self.player1_score} - {self.player2_score}", 
-                                            True, WHITE)
+        self._load_fonts()
+        score_text = render_text(self.font_small, f"{self.player1_score} - {self.player2_score}",
+                                 True, WHITE)
         score_rect = score_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 30))
         screen.blit(score_text, score_rect)
     
@@ -68,7 +80,7 @@ class Scoreboard:
         self.player1_score = 0
         self.player2_score = 0
         self.last_scorer = None
-        self.last_score_time = 0
+        self.last_score_tick = -SCORE_FLASH_TICKS
     
     def is_game_over(self):
         """Verifica si el juego ha terminado"""
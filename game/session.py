@@ -0,0 +1,139 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Partida Autoritativa del Servidor
+# ============================================
+
+from collections import deque
+from game.config import *
+from game.simulation import Simulation, TickInput
+from game.replay import ReplayRecorder
+from game.protocol import (
+    SnapshotMessage, ScoreMessage, MAX_DELTA_DISTANCE,
+    quantize_snapshot, dequantize_snapshot, encode_snapshot, encode_snapshot_delta,
+)
+
+
+class MatchSession:
+    """Simulación autoritativa de una partida en línea
+    
+    El servidor es dueño de la pelota, las paletas y la puntuación. Los
+    clientes solo envían entradas (InputMessage); se encolan por jugador y se
+    consume una por tick. Cada `snapshot_interval` ticks se genera un
+    SnapshotMessage por jugador con la última entrada suya ya simulada.
+    
+    Los estados se envían como delta respecto al último que el jugador
+    confirmó (InputMessage.snapshot_tick); si ese estado ya no está en el
+    historial o no hay confirmación se envía un estado completo.
+    
+    Con `replay_path` la partida se graba (entradas simuladas de cada tick);
+    hay que llamar a `close()` al terminar.
+    """
+    
+    def __init__(self, max_score=MAX_SCORE, tick_rate=SERVER_TICK_RATE, snapshot_rate=SNAPSHOT_RATE,
+                 replay_path=None):
+        self.simulation = Simulation(mode=MODE_ONLINE, max_score=max_score)
+        self.max_score = max_score
+        self.tick_rate = tick_rate
+        self.snapshot_interval = max(1, round(tick_rate / snapshot_rate))
+        
+        self.pending_inputs = {1: deque(), 2: deque()}
+        self.directions = {1: 0, 2: 0}
+        self.acked_seq = {1: 0, 2: 0}
+        self.received_seq = {1: 0, 2: 0}
+        self.acked_tick = {1: None, 2: None}
+        self.sent_snapshots = {1: deque(maxlen=SNAPSHOT_BUFFER_SIZE), 2: deque(maxlen=SNAPSHOT_BUFFER_SIZE)}
+        self.stats = {"keyframes": 0, "deltas": 0, "bytes": 0}
+        self.replay_path = replay_path
+        self.recorder = None
+    
+    def add_input(self, player_id, message):
+        """Encola una entrada de un jugador (descarta duplicadas o viejas)"""
+        if player_id not in self.pending_inputs or message.seq <= self.received_seq[player_id]:
+            return
+        
+        if message.snapshot_tick and (self.acked_tick[player_id] or 0) < message.snapshot_tick:
+            self.acked_tick[player_id] = message.snapshot_tick
+        self.received_seq[player_id] = message.seq
+        queue = self.pending_inputs[player_id]
+        queue.append(message)
+        while len(queue) > MAX_QUEUED_INPUTS:
+            queue.popleft()
+    
+    def is_ready(self):
+        """La partida empieza cuando ambos jugadores enviaron su primera entrada"""
+        return all(seq > 0 for seq in self.received_seq.values())
+    
+    def step(self):
+        """Avanza un tick; retorna (eventos, si toca enviar snapshot)"""
+        if not self.is_ready():
+            return [], False
+        if self.replay_path and self.recorder is None:
+            # El archivo se crea con el primer tick: las salas que nunca empiezan no dejan rastro
+            self.recorder = ReplayRecorder(self.simulation, self.replay_path)
+        
+        for player_id, queue in self.pending_inputs.items():
+            if queue:
+                message = queue.popleft()
+                self.directions[player_id] = max(-1, min(1, message.direction))
+                self.acked_seq[player_id] = message.seq
+            # Sin entrada nueva se repite la última dirección conocida
+        
+        inputs = TickInput(p1=self.directions[1], p2=self.directions[2])
+        events = self.simulation.step(inputs)
+        if self.recorder is not None:
+            self.recorder.record(inputs)
+        send = bool(events) or self.simulation.tick % self.snapshot_interval == 0
+        return events, send
+    
+    def snapshot(self, player_id):
+        """Construye el estado autoritativo para un jugador"""
+        sim = self.simulation
+        return SnapshotMessage(
+            sim.tick, self.acked_seq.get(player_id, 0),
+            sim.ball.x, sim.ball.y, sim.ball.speed_x, sim.ball.speed_y,
+            sim.paddle1.y, sim.paddle1.velocity, sim.paddle2.y, sim.paddle2.velocity,
+            sim.scoreboard.player1_score, sim.scoreboard.player2_score,
+        )
+    
+    def score(self):
+        """Marcador actual como ScoreMessage (ganador 0 si la partida sigue)"""
+        scoreboard = self.simulation.scoreboard
+        winner = 0
+        if scoreboard.player1_score >= self.max_score:
+            winner = 1
+        elif scoreboard.player2_score >= self.max_score:
+            winner = 2
+        return ScoreMessage(self.simulation.tick, scoreboard.player1_score, scoreboard.player2_score, winner)
+    
+    def encode_snapshot(self, player_id):
+        """Codifica el estado para un jugador: delta si hay base confirmada, si no completo"""
+        snapshot = self.snapshot(player_id)
+        tick = snapshot.tick
+        values = quantize_snapshot(snapshot)
+        history = self.sent_snapshots[player_id]  # (tick, valores cuantizados)
+        
+        acked = self.acked_tick[player_id]
+        baseline = None
+        if acked is not None and 0 < tick - acked <= MAX_DELTA_DISTANCE:
+            baseline = next((sent for sent_tick, sent in history if sent_tick == acked), None)
+        
+        if baseline is not None:
+            data = encode_snapshot_delta(tick, snapshot.ack_seq, values, acked, baseline)
+            self.stats["deltas"] += 1
+        else:
+            data = encode_snapshot(dequantize_snapshot(tick, snapshot.ack_seq, values))
+            self.stats["keyframes"] += 1
+        
+        history.append((tick, values))
+        self.stats["bytes"] += len(data)
+        return data
+    
+    def is_game_over(self):
+        """Verifica si la partida ha terminado"""
+        return self.simulation.is_game_over()
+    
+    def close(self):
+        """Termina de escribir la repetición, si se está grabando"""
+        self.replay_path = None
+        if self.recorder is not None:
+            self.recorder.close()
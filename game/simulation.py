@@ -0,0 +1,222 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Simulación sin pygame (núcleo del juego)
+# ============================================
+
+import hashlib
+import random
+import struct
+from collections import namedtuple
+from game.config import *
+from game.ball import Ball
+from game.paddle import Paddle
+from game.scoreboard import Scoreboard
+from game.ai import AI
+from game.physics import handle_ball_collision
+from game.rng import TickRandom
+
+
+# Entrada de un tick: dirección de cada paleta (-1 arriba, 0 quieto, 1 abajo)
+TickInput = namedtuple("TickInput", ["p1", "p2"], defaults=(0, 0))
+
+# Flujos de números aleatorios de cada partida (ver TickRandom)
+RNG_STREAM_SERVE = 1
+RNG_STREAM_AI = 2
+
+# Eventos que devuelve Simulation.step
+EVENT_PADDLE_HIT = "paddle_hit"
+EVENT_GOAL = "goal"
+
+# Registro de tamaño fijo con el estado de una partida (ver Simulation.save_state):
+# tick, countdown | pelota x, y, vx, vy, último golpe | paleta 1 y, velocidad, brillo |
+# paleta 2 y, velocidad, brillo | puntos 1, 2, último en anotar, tick del punto |
+# IA contador de reacción, objetivo
+_STATE = struct.Struct("<iH ddddi ddH ddH HHBi id")
+STATE_SIZE = _STATE.size
+
+
+class Simulation:
+    """Estado y física de una partida, sin pantalla, fuentes ni reloj
+    
+    Avanza pelota, paletas, colisiones y puntuación un tick por llamada a
+    `step()`. Se puede usar en servidores y procesos por lotes sin iniciar SDL.
+    
+    Con la misma semilla y las mismas entradas dos simulaciones evolucionan
+    igual: los saques y los errores de la IA salen de generadores propios de
+    la partida que solo dependen de (semilla, tick), nunca del `random` global.
+    """
+    
+    def __init__(self, mode=MODE_LOCAL_MULTIPLAYER, difficulty=DIFFICULTY_NORMAL, max_score=MAX_SCORE, seed=None):
+        self.mode = mode
+        self.difficulty = difficulty
+        self.max_score = max_score
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.tick = 0  # Reloj de la simulación: todo lo temporal se mide en ticks
+        self.serve_rng = TickRandom(self.seed, RNG_STREAM_SERVE)
+        self.ai_rng = TickRandom(self.seed, RNG_STREAM_AI)
+        
+        self.ball = Ball(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2, rng=self._serve_rng())
+        self.paddle1 = Paddle(20, WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2)
+        self.paddle2 = Paddle(WINDOW_WIDTH - 20 - PADDLE_WIDTH, WINDOW_HEIGHT // 2 - PADDLE_HEIGHT // 2)
+        self.scoreboard = Scoreboard(max_score=max_score)
+        
+        self.ai = None
+        if mode == MODE_SINGLE_PLAYER:
+            self.ai = AI(self.paddle2, self.ball, difficulty=difficulty, rng=self.ai_rng)
+        
+        # IA opcional para la paleta 1 (torneos IA contra IA): un objeto con
+        # update() y reset() que mueve la paleta directamente, como la IA de
+        # la derecha, en lugar de inputs.p1. Su estado no entra en save_state
+        self.left_ai = None
+        
+        self.countdown = 0
+        self.profiler = None  # FrameProfiler opcional: tiempo de IA, física y colisiones
+    
+    def _serve_rng(self):
+        """Generador para el saque del tick actual (no guarda estado entre saques)"""
+        self.serve_rng.seek(self.tick)
+        return self.serve_rng
+    
+    def step(self, inputs=TickInput()):
+        """Avanza la simulación un tick y retorna la lista de eventos ocurridos
+        
+        Cada evento es una tupla: (EVENT_PADDLE_HIT, jugador, x, y) o
+        (EVENT_GOAL, jugador_que_anota).
+        """
+        events = []
+        self.tick += 1
+        tick = self.tick
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.mark("update")
+        
+        # Paletas
+        if self.left_ai is not None:
+            self.left_ai.update()
+        else:
+            self.paddle1.update(analog_input=inputs.p1)
+        if self.ai is not None:
+            if profiler is not None:
+                profiler.mark("physics")
+            self.ai_rng.seek(tick)
+            self.ai.update()
+            if profiler is not None:
+                profiler.mark("ai")
+        else:
+            self.paddle2.update(analog_input=inputs.p2)
+        
+        # Pelota
+        self.ball.update()
+        if profiler is not None:
+            profiler.mark("physics")
+        
+        # Colisiones con paletas
+        if handle_ball_collision(self.ball, self.paddle1, from_left=True, tick=tick):
+            events.append((EVENT_PADDLE_HIT, 1, self.ball.x, self.ball.y))
+        
+        if handle_ball_collision(self.ball, self.paddle2, from_left=False, tick=tick):
+            events.append((EVENT_PADDLE_HIT, 2, self.ball.x, self.ball.y))
+        
+        # Verificar puntos
+        if self.ball.x < 0:
+            self.scoreboard.update_score(2, tick=tick)
+            self.ball.reset(rng=self._serve_rng())
+            self.countdown = FPS  # Pequeña pausa antes de continuar
+            events.append((EVENT_GOAL, 2))
+        
+        elif self.ball.x > WINDOW_WIDTH:
+            self.scoreboard.update_score(1, tick=tick)
+            self.ball.reset(rng=self._serve_rng())
+            self.countdown = FPS
+            events.append((EVENT_GOAL, 1))
+        
+        # Countdown
+        if self.countdown > 0:
+            self.countdown -= 1
+        
+        if profiler is not None:
+            profiler.mark("collisions")
+        return events
+    
+    def apply_snapshot(self, snapshot):
+        """Copia el estado autoritativo recibido del servidor (SnapshotMessage)"""
+        self.ball.record_trail()
+        self.ball.x = snapshot.ball_x
+        self.ball.y = snapshot.ball_y
+        self.ball.speed_x = snapshot.ball_vx
+        self.ball.speed_y = snapshot.ball_vy
+        self.paddle1.y = snapshot.paddle1_y
+        self.paddle1.velocity = snapshot.paddle1_velocity
+        self.paddle2.y = snapshot.paddle2_y
+        self.paddle2.velocity = snapshot.paddle2_velocity
+        self.tick = snapshot.tick
+        self.apply_score(snapshot.score1, snapshot.score2, snapshot.tick)
+    
+    def apply_score(self, score1, score2, tick):
+        """Copia el marcador del servidor"""
+        # Puntos nuevos: mismo efecto que Scoreboard.update_score
+        scoreboard = self.scoreboard
+        if score1 > scoreboard.player1_score:
+            scoreboard.last_scorer = 1
+            scoreboard.last_score_tick = tick
+        elif score2 > scoreboard.player2_score:
+            scoreboard.last_scorer = 2
+            scoreboard.last_score_tick = tick
+        scoreboard.player1_score = score1
+        scoreboard.player2_score = score2
+    
+    def save_state(self):
+        """Captura el estado de la partida en un registro de STATE_SIZE bytes
+        
+        Incluye pelota, paletas, marcador y el contador de la IA; no el
+        rastro de la pelota (solo visual) ni nada de pygame. Los decimales se
+        guardan en doble precisión para que restaurar y re-simular dé
+        exactamente el mismo resultado.
+        """
+        ball, paddle1, paddle2, scoreboard, ai = self.ball, self.paddle1, self.paddle2, self.scoreboard, self.ai
+        return _STATE.pack(
+            self.tick, self.countdown,
+            ball.x, ball.y, ball.speed_x, ball.speed_y, ball.last_collision_tick,
+            paddle1.y, paddle1.velocity, paddle1.glow_intensity,
+            paddle2.y, paddle2.velocity, paddle2.glow_intensity,
+            scoreboard.player1_score, scoreboard.player2_score,
+            scoreboard.last_scorer or 0, scoreboard.last_score_tick,
+            ai.reaction_counter if ai else 0, ai.target_y if ai else 0.0,
+        )
+    
+    def load_state(self, state):
+        """Restaura un registro creado con `save_state`"""
+        ball, paddle1, paddle2, scoreboard, ai = self.ball, self.paddle1, self.paddle2, self.scoreboard, self.ai
+        (
+            self.tick, self.countdown,
+            ball.x, ball.y, ball.speed_x, ball.speed_y, ball.last_collision_tick,
+            paddle1.y, paddle1.velocity, paddle1.glow_intensity,
+            paddle2.y, paddle2.velocity, paddle2.glow_intensity,
+            scoreboard.player1_score, scoreboard.player2_score,
+            last_scorer, scoreboard.last_score_tick,
+            reaction_counter, target_y,
+        ) = _STATE.unpack(state)
+        scoreboard.last_scorer = last_scorer or None
+        if ai is not None:
+            ai.reaction_counter = reaction_counter
+            ai.target_y = target_y
+    
+    def state_hash(self):
+        """Huella corta del estado (para comparar partidas sin guardar el estado completo)"""
+        return hashlib.blake2b(self.save_state(), digest_size=8).hexdigest()
+    
+    def is_game_over(self):
+        """Verifica si la partida ha terminado"""
+        return self.scoreboard.is_game_over()
+    
+    def reset(self):
+        """Reinicia la partida: queda igual que una simulación nueva con la misma semilla"""
+        self.tick = 0
+        self.ball.reset(rng=self._serve_rng(), opening=True)
+        self.paddle1.reset()
+        self.paddle2.reset()
+        self.scoreboard.reset()
+        for ai in (self.ai, self.left_ai):
+            if ai:
+                ai.reset()
+        self.countdown = 0
@@ -0,0 +1,77 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Caché de Textos Renderizados (LRU compartida)
+# ============================================
+
+from collections import OrderedDict
+from game.config import *
+
+
+class TextCache:
+    """Superficies de texto ya renderizadas, las menos usadas salen primero
+    
+    La clave es (fuente, texto, antialias, color, fondo): la fuente cuenta
+    por identidad, así que conviene reutilizar los objetos Font. El tamaño
+    está acotado por número de textos y por bytes de píxeles. Las
+    superficies se comparten: quien las recibe no debe modificarlas.
+    """
+    
+    def __init__(self, max_entries=TEXT_CACHE_SIZE, max_bytes=TEXT_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # clave -> superficie
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def render(self, font, text, antialias, color, background=None):
+        """Como font.render, pero reutiliza la superficie si ya se renderizó"""
+        key = (font, text, antialias, tuple(color), background and tuple(background))
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.entries[key] = surface
+        self.bytes += _surface_bytes(surface)
+        while len(self.entries) > self.max_entries or (self.bytes > self.max_bytes and len(self.entries) > 1):
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= _surface_bytes(evicted)
+            self.evictions += 1
+        return surface
+    
+    def clear(self):
+        """Vacía la caché (los contadores se conservan)"""
+        self.entries.clear()
+        self.bytes = 0
+    
+    def stats(self):
+        """Contadores para diagnóstico"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _surface_bytes(surface):
+    """Memoria aproximada de los píxeles de una superficie"""
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+# Caché compartida por el marcador, los menús y las pantallas de main.py
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color, background=None):
+    """font.render con la caché compartida (mismos argumentos)"""
+    return text_cache.render(font, text, antialias, color, background)
@@ -0,0 +1,277 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Torneo de IA sin pantalla (todas las CPU, semillas fijas)
+# ============================================
+
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import time
+from collections import deque
+from game.config import *
+from game.ai import AI
+from game.paddle import Paddle
+from game.physics import fold_into_range
+from game.rng import TickRandom
+from game.simulation import Simulation, TickInput, RNG_STREAM_AI
+
+
+DIFFICULTIES = (DIFFICULTY_EASY, DIFFICULTY_NORMAL, DIFFICULTY_HARD)
+MAX_MATCH_TICKS = 5 * 60 * FPS  # Al llegar aquí gana quien va delante (empate si van iguales)
+
+
+class HumanModel:
+    """Jugador humano aproximado para la paleta izquierda
+    
+    Ve la pelota con `reaction_ticks` de retraso, apunta con un error
+    aleatorio que cambia en cada jugada y solo pulsa arriba/abajo, como con
+    el teclado. Con `anticipate=True` calcula dónde llegará la pelota (con
+    rebotes) en lugar de seguir su altura.
+    """
+    
+    def __init__(self, reaction_ticks=12, aim_error=30, deadzone=10, anticipate=False, rng=None):
+        self.reaction_ticks = reaction_ticks
+        self.aim_error = aim_error
+        self.deadzone = deadzone
+        self.anticipate = anticipate
+        self.rng = rng or random.Random()
+        self.seen = deque(maxlen=reaction_ticks + 1)
+        self.offset = 0.0
+        self.approaching = False
+    
+    def __call__(self, simulation):
+        """Dirección de la paleta 1 en este tick (-1, 0, 1)"""
+        ball, paddle = simulation.ball, simulation.paddle1
+        self.seen.append((ball.x, ball.y, ball.speed_x, ball.speed_y))
+        x, y, speed_x, speed_y = self.seen[0]
+        
+        approaching = speed_x < 0
+        if approaching and not self.approaching:
+            self.offset = self.rng.uniform(-self.aim_error, self.aim_error)  # Nueva jugada
+        self.approaching = approaching
+        
+        if not approaching:
+            target = WINDOW_HEIGHT / 2
+        elif self.anticipate:
+            steps = max(0.0, (x - paddle.x - paddle.width) / -speed_x)
+            target = fold_into_range(y + speed_y * steps, 0, WINDOW_HEIGHT) + self.offset
+        else:
+            target = y + self.offset
+        
+        difference = target - (paddle.y + paddle.height / 2)
+        if abs(difference) <= self.deadzone:
+            return 0
+        return 1 if difference > 0 else -1
+
+
+class _MirroredBall:
+    """Copia de la pelota reflejada en horizontal (para una IA a la izquierda)"""
+    
+    def __init__(self):
+        self.x = self.y = self.speed_x = self.speed_y = 0.0
+        self.size = BALL_SIZE
+    
+    def sync(self, ball):
+        """Copia la posición y velocidad de la pelota real, reflejadas"""
+        self.x = WINDOW_WIDTH - ball.x
+        self.y = ball.y
+        self.speed_x = -ball.speed_x
+        self.speed_y = ball.speed_y
+
+
+class AIPlayer:
+    """La IA de `game.ai` jugando con la paleta izquierda
+    
+    La IA solo sabe jugar a la derecha: ve la pelota reflejada y mueve una
+    paleta fantasma, cuya posición y velocidad se copian tal cual a la
+    paleta 1. Se engancha como `simulation.left_ai`, así que la paleta se
+    mueve dentro de step() exactamente como la de la IA rival, sin la
+    inercia de las entradas de un jugador.
+    """
+    
+    def __init__(self, simulation, difficulty, seed=0):
+        self.simulation = simulation
+        self.paddle = simulation.paddle1
+        self.shadow = Paddle(WINDOW_WIDTH - 20 - PADDLE_WIDTH, self.paddle.y)
+        self.ball = _MirroredBall()
+        self.rng = TickRandom(seed, RNG_STREAM_AI + 1)  # Flujo distinto del de la IA rival
+        self.ai = AI(self.shadow, self.ball, difficulty=difficulty, rng=self.rng)
+        simulation.left_ai = self
+    
+    def __call__(self, simulation):
+        """Entrada de la paleta 1: ninguna, la mueve update()"""
+        return 0
+    
+    def update(self):
+        """Mueve la paleta 1 un tick (lo llama Simulation.step)"""
+        paddle, shadow = self.paddle, self.shadow
+        self.ball.sync(self.simulation.ball)
+        shadow.y = paddle.y
+        shadow.velocity = paddle.velocity
+        self.rng.seek(self.simulation.tick)
+        self.ai.update()
+        paddle.y = shadow.y
+        paddle.velocity = shadow.velocity
+    
+    def reset(self):
+        """Olvida la reacción en curso (Simulation.reset)"""
+        self.ai.reset()
+
+
+# Contendientes de la paleta izquierda: nombre -> (tipo, parámetros)
+# El error de puntería decide casi todo: por encima de media paleta (45 px)
+# el humano pierde siempre y por debajo de ~35 px casi no falla. El experto
+# le gana a veces a la IA fácil; entre jugadores que no fallan muchas
+# partidas llegan a MAX_MATCH_TICKS, de ahí la columna de empates. La IA
+# normal y la difícil nunca yerran más de media paleta: entre ellas (y en
+# su espejo) todo es empate; ia-easy contra la IA fácil queda cerca del 50%.
+CONTENDERS = {
+    "humano-novato": ("human", {"reaction_ticks": 20, "aim_error": 70, "deadzone": 12}),
+    "humano-medio": ("human", {"reaction_ticks": 12, "aim_error": 42, "deadzone": 8, "anticipate": True}),
+    "humano-experto": ("human", {"reaction_ticks": 8, "aim_error": 35, "deadzone": 6, "anticipate": True}),
+    "ia-easy": ("ai", {"difficulty": DIFFICULTY_EASY}),
+    "ia-normal": ("ai", {"difficulty": DIFFICULTY_NORMAL}),
+    "ia-hard": ("ai", {"difficulty": DIFFICULTY_HARD}),
+}
+
+
+def _create_player(contender, simulation, seed):
+    """Construye el controlador de un contendiente con la semilla de la partida"""
+    kind, params = CONTENDERS[contender]
+    if kind == "ai":
+        return AIPlayer(simulation, seed=seed, **params)
+    return HumanModel(rng=random.Random(seed), **params)
+
+
+def match_seed(seed, contender, difficulty, index):
+    """Semilla de una partida: fija para (semilla del torneo, emparejamiento, número)"""
+    return random.Random(f"{seed}:{contender}:{difficulty}:{index}").getrandbits(32)
+
+
+def play_match(task):
+    """Juega una partida: contendiente (izquierda) contra la IA (derecha)
+    
+    `task` es (contendiente, dificultad de la IA, semilla, puntos para ganar).
+    Retorna (contendiente, dificultad, ganador, ticks). Si se alcanza
+    MAX_MATCH_TICKS gana quien va delante; ganador 0 = empate.
+    """
+    contender, difficulty, seed, max_score = task
+    simulation = Simulation(mode=MODE_SINGLE_PLAYER, difficulty=difficulty, max_score=max_score, seed=seed)
+    player = _create_player(contender, simulation, seed)
+    
+    while not simulation.is_game_over() and simulation.tick < MAX_MATCH_TICKS:
+        simulation.step(TickInput(p1=player(simulation)))
+    
+    scoreboard = simulation.scoreboard
+    winner = 0
+    if scoreboard.player1_score > scoreboard.player2_score:
+        winner = 1
+    elif scoreboard.player2_score > scoreboard.player1_score:
+        winner = 2
+    return contender, difficulty, winner, simulation.tick
+
+
+def wilson_interval(wins, total, z=1.96):
+    """Intervalo de confianza de Wilson para una proporción (95% por defecto)"""
+    if total == 0:
+        return 0.0, 1.0
+    p = wins / total
+    denominator = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def run_tournament(contenders, difficulties=DIFFICULTIES, matches=100, max_score=MAX_SCORE, seed=0,
+                   workers=None):
+    """Juega `matches` partidas por emparejamiento repartidas entre procesos
+    
+    Retorna un dict {(contendiente, dificultad): resultados} con victorias,
+    derrotas, empates, ticks, la tasa de empates, la tasa de victorias del
+    contendiente sobre las partidas decididas (None si no hubo ninguna) y su
+    intervalo de confianza.
+    """
+    tasks = [
+        (contender, difficulty, match_seed(seed, contender, difficulty, index), max_score)
+        for contender in contenders for difficulty in difficulties for index in range(matches)
+    ]
+    results = {
+        (contender, difficulty): {"wins": 0, "losses": 0, "draws": 0, "ticks": 0}
+        for contender in contenders for difficulty in difficulties
+    }
+    
+    workers = workers or multiprocessing.cpu_count()
+    chunksize = max(1, len(tasks) // (8 * workers))
+    with multiprocessing.Pool(workers) as pool:
+        for contender, difficulty, winner, ticks in pool.imap_unordered(play_match, tasks, chunksize):
+            entry = results[(contender, difficulty)]
+            entry[("draws", "wins", "losses")[winner]] += 1
+            entry["ticks"] += ticks
+    
+    for entry in results.values():
+        decided = entry["wins"] + entry["losses"]
+        entry["win_rate"] = entry["wins"] / decided if decided else None
+        entry["interval"] = wilson_interval(entry["wins"], decided)
+        entry["draw_rate"] = entry["draws"] / matches if matches else 0.0
+    return results
+
+
+def format_table(results, contenders, difficulties):
+    """Tabla de texto por IA: % de victorias en partidas decididas [IC 95%] y % de empates
+    
+    Sin partidas decididas (todas empate) muestra "n/a" en lugar de un 0%.
+    """
+    width = 34
+    lines = ["contendiente".ljust(16) + "".join(f"vs IA {d} (vict. | emp.)".ljust(width) for d in difficulties)]
+    for contender in contenders:
+        row = contender.ljust(16)
+        for difficulty in difficulties:
+            entry = results[(contender, difficulty)]
+            if entry["win_rate"] is None:
+                cell = "n/a".rjust(6).ljust(22)
+            else:
+                low, high = entry["interval"]
+                cell = f"{entry['win_rate']:6.1%} [{low:.1%}-{high:.1%}]".ljust(22)
+            row += f"{cell}| {entry['draw_rate']:5.1%}".ljust(width)
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def main():
+    """Punto de entrada: python -m game.tournament --matches 500"""
+    parser = argparse.ArgumentParser(description="Enfrenta contendientes a la IA en miles de partidas sin pantalla")
+    parser.add_argument("--matches", type=int, default=200, help="Partidas por emparejamiento")
+    parser.add_argument("--max-score", type=int, default=MAX_SCORE, help="Puntos para ganar")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del torneo (mismos resultados con la misma)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (por defecto uno por núcleo)")
+    parser.add_argument("--contenders", nargs="+", choices=sorted(CONTENDERS), default=list(CONTENDERS),
+                        help="Contendientes de la paleta izquierda")
+    parser.add_argument("--difficulties", nargs="+", choices=DIFFICULTIES, default=list(DIFFICULTIES),
+                        help="Dificultades de la IA rival")
+    parser.add_argument("--json", metavar="ARCHIVO", help="Guardar también los resultados en JSON")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    results = run_tournament(args.contenders, args.difficulties, matches=args.matches,
+                             max_score=args.max_score, seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    
+    total = len(results) * args.matches
+    ticks = sum(entry["ticks"] for entry in results.values())
+    draws = sum(entry["draws"] for entry in results.values())
+    print(format_table(results, args.contenders, args.difficulties))
+    print(f"\n{total} partidas ({draws} empates), {ticks:,} ticks en {elapsed:.1f} s "
+          f"({ticks / max(elapsed, 1e-9):,.0f} ticks/s)")
+    
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump([
+                {"contender": contender, "difficulty": difficulty, **entry}
+                for (contender, difficulty), entry in results.items()
+            ], file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Transporte UDP (canal secuenciado + canal fiable)
+# ============================================
+
+import struct
+import time
+from collections import deque
+from game.config import *
+from game.protocol import FrameReader, ProtocolError
+
+
+# Cabecera de cada datagrama: secuencia, último mensaje fiable recibido en
+# orden, id del primer mensaje fiable incluido y cuántos fiables vienen
+PACKET_HEADER = struct.Struct("!IIIB")
+
+
+class UdpChannel:
+    """Estado de una conexión UDP con un par (independiente del socket)
+    
+    Cada datagrama lleva mensajes ya enmarcados (mismo formato que por TCP)
+    en dos canales:
+    
+    - No fiable secuenciado: los mensajes de un datagrama más viejo que el
+      último recibido se descartan. Sirve para estados y entradas, que
+      quedan obsoletos en un tick.
+    - Fiable ordenado: unión, bienvenida y marcador. Se repiten al inicio de
+      cada datagrama hasta que el par confirma su id en la cabecera.
+    """
+    
+    def __init__(self, address=None):
+        self.address = address
+        self.send_seq = 0
+        self.received_seq = 0
+        self.reliable_out = deque()  # (id, mensaje enmarcado) sin confirmar
+        self.next_reliable_id = 1
+        self.reliable_received = 0  # Último id fiable entregado en orden
+        self.last_send_time = 0.0
+        self.last_receive_time = time.perf_counter()
+    
+    def queue_reliable(self, frame):
+        """Encola un mensaje enmarcado en el canal fiable"""
+        self.reliable_out.append((self.next_reliable_id, frame))
+        self.next_reliable_id += 1
+    
+    def has_pending_reliable(self):
+        """Verifica si quedan mensajes fiables sin confirmar"""
+        return bool(self.reliable_out)
+    
+    def needs_send(self, now):
+        """Toca enviar aunque no haya datos: reenvío fiable o keepalive"""
+        elapsed = now - self.last_send_time
+        if self.reliable_out and elapsed >= RELIABLE_RESEND_INTERVAL:
+            return True
+        return elapsed >= UDP_KEEPALIVE_INTERVAL
+    
+    def build_packet(self, payload=b"", now=None):
+        """Arma un datagrama con los fiables pendientes y `payload` (no fiable)"""
+        self.send_seq += 1
+        self.last_send_time = time.perf_counter() if now is None else now
+        
+        reliable = bytearray()
+        count = 0
+        first_id = self.reliable_out[0][0] if self.reliable_out else 0
+        room = MAX_DATAGRAM_SIZE - PACKET_HEADER.size - len(payload)
+        for _, frame in self.reliable_out:
+            if count == 255 or len(reliable) + len(frame) > room:
+                break  # El resto viaja en los siguientes datagramas
+            reliable += frame
+            count += 1
+        
+        header = PACKET_HEADER.pack(self.send_seq, self.reliable_received, first_id, count)
+        return header + reliable + payload
+    
+    def receive_packet(self, data, now=None):
+        """Procesa un datagrama y retorna la lista de (tipo, mensaje) a entregar"""
+        if len(data) < PACKET_HEADER.size:
+            raise ProtocolError("Datagrama demasiado corto")
+        seq, ack, first_id, count = PACKET_HEADER.unpack_from(data)
+        self.last_receive_time = time.perf_counter() if now is None else now
+        
+        # Un datagrama contiene mensajes completos
+        reader = FrameReader()
+        messages = reader.feed(data[PACKET_HEADER.size:])
+        if reader.buffer or len(messages) < count:
+            raise ProtocolError("Datagrama con mensajes incompletos")
+        
+        # Confirmaciones del par
+        while self.reliable_out and self.reliable_out[0][0] <= ack:
+            self.reliable_out.popleft()
+        
+        # Canal fiable: entregar solo el siguiente id esperado (ignora repetidos)
+        delivered = []
+        for offset, message in enumerate(messages[:count]):
+            if first_id + offset == self.reliable_received + 1:
+                delivered.append(message)
+                self.reliable_received += 1
+        
+        # Canal no fiable: descartar lo más viejo que lo último recibido
+        if seq > self.received_seq:
+            self.received_seq = seq
+            delivered.extend(messages[count:])
+        return delivered
@@ -7,48 +7,37 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from game.network import NetworkServer
-from game.config import DEFAULT_HOST, DEFAULT_PORT
-import signal
-
-
-def signal_handler(sig, frame):
-    """Maneja Ctrl+C"""
-    print("\n[SERVIDOR] Recibida señal de cierre...")
-    global server
-    if 'server' in globals():
-        server.stop()
-    sys.exit(0)
+from game.match_server import MatchServer
+from game.config import DEFAULT_HOST, DEFAULT_PORT, RECORD_REPLAYS, REPLAY_DIR
+import asyncio
 
 
 def main():
     """Función principal del servidor"""
-    global server
-    
     print("=" * 50)
     print("PING PONG ULTIMATE - SERVIDOR MULTIJUGADOR")
     print("=" * 50)
     
-    # Configurar manejador de señales
-    signal.signal(signal.SIGINT, signal_handler)
+    # Crear e iniciar servidor (varias salas en un solo proceso)
+    server = MatchServer(host=DEFAULT_HOST, port=DEFAULT_PORT,
+                         replay_dir=REPLAY_DIR if RECORD_REPLAYS else None)
     
-    # Crear e iniciar servidor
-    server = NetworkServer(host=DEFAULT_HOST, port=DEFAULT_PORT)
-    
-    if server.start():
-        print(f"\n✓ Servidor escuchando en {DEFAULT_HOST}:{DEFAULT_PORT}")
-        print("Esperando 2 jugadores para iniciar...\n")
-        
-        # Mantener el servidor corriendo
+    async def run():
         try:
-            import time
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            pass
-    else:
-        print("✗ Error al iniciar el servidor")
-        sys.exit(1)
+            await server.start()
+        except OSError as e:
+            print(f"✗ Error al iniciar el servidor: {e}")
+            sys.exit(1)
+        
+        print(f"\n✓ Servidor escuchando en {DEFAULT_HOST}:{DEFAULT_PORT}")
+        print("Cada sala inicia su partida cuando tiene 2 jugadores...\n")
+        await server.serve_forever()
+    
+    # Mantener el servidor corriendo hasta Ctrl+C
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\n[SERVIDOR] Recibida señal de cierre...")
 
 
 if __name__ == "__main__":
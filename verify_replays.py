@@ -0,0 +1,107 @@
+# ============================================
+# PING PONG ULTIMATE EDITION
+# Verificador de Repeticiones (sin pantalla, en paralelo)
+# ============================================
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from game.config import REPLAY_DIR, MODE_LOCAL_MULTIPLAYER
+from game.replay import ReplayRecorder, verify_replay
+from game.simulation import Simulation, TickInput
+
+
+def find_replays(paths):
+    """Archivos .ppr indicados o contenidos (recursivamente) en los directorios"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.extend(os.path.join(root, name) for name in files if name.endswith(".ppr"))
+        else:
+            found.append(path)
+    return sorted(found)
+
+
+def self_test():
+    """Comprueba que el verificador acepta una repetición intacta y rechaza una alterada
+    
+    Graba una partida a 1 punto en la que el marcador se cambia a 3 después
+    de crear la simulación: al re-simularla con las reglas grabadas termina
+    en el primer punto, antes que la grabación y sin estados intermedios
+    que lo delaten. Retorna el código de salida.
+    """
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for label, played_to, expected in (("intacta", 1, "ok"), ("alterada", 3, "divergent")):
+            path = os.path.join(directory, f"{label}.ppr")
+            sim = Simulation(mode=MODE_LOCAL_MULTIPLAYER, max_score=1, seed=1)
+            sim.scoreboard.max_score = played_to
+            recorder = ReplayRecorder(sim, path, keyframe_interval=60000)
+            inputs = TickInput(p1=-1, p2=1)  # Paletas en los extremos: los puntos llegan solos
+            while not sim.is_game_over() and sim.tick < 50000:
+                sim.step(inputs)
+                recorder.record(inputs)
+            recorder.close()
+            
+            result = verify_replay(path)
+            ok = result["status"] == expected
+            failures += not ok
+            print(f"{'✓' if ok else '✗'} repetición {label}: {result['status']} (se esperaba {expected}), "
+                  f"marcador {result.get('score')} (grabado {result.get('expected_score')})")
+    return 1 if failures else 0
+
+
+def main():
+    """Función principal del verificador"""
+    parser = argparse.ArgumentParser(
+        description="Re-simula repeticiones y reporta las que ya no dan el mismo marcador o estado final")
+    parser.add_argument("paths", nargs="*", default=[REPLAY_DIR], help="Archivos .ppr o directorios")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Procesos en paralelo")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar también las repeticiones correctas")
+    parser.add_argument("--self-test", action="store_true",
+                        help="Comprobar que una repetición alterada a propósito se detecta")
+    args = parser.parse_args()
+    
+    if args.self_test:
+        return self_test()
+    
+    replays = find_replays(args.paths)
+    if not replays:
+        print("No se encontraron repeticiones")
+        return 0
+    
+    start = time.perf_counter()
+    counts = {"ok": 0, "divergent": 0, "error": 0}
+    ticks = 0
+    # Cada repetición es independiente: un proceso por núcleo y lotes para repartir la carga
+    chunksize = max(1, len(replays) // (4 * max(1, args.workers)))
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for result in pool.map(verify_replay, replays, chunksize=chunksize):
+            counts[result["status"]] += 1
+            ticks += result["ticks"]
+            status = result["status"]
+            
+            if status == "divergent":
+                print(f"✗ {result['path']}: diverge en el tick {result['first_divergence']} | "
+                      f"marcador {result['score']} (grabado {result['expected_score']}) | "
+                      f"huella {result['hash']} (grabada {result['expected_hash']})")
+            elif status == "error":
+                print(f"✗ {result['error']}")
+            elif args.verbose:
+                print(f"✓ {result['path']}: marcador {result['score']}")
+    
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(replays)} repeticiones, {ticks} ticks en {elapsed:.1f} s "
+          f"({ticks / max(elapsed, 1e-9):,.0f} ticks/s): {counts['ok']} correctas, "
+          f"{counts['divergent']} con diferencias, {counts['error']} con errores")
+    return 1 if counts["divergent"] or counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())